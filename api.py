@@ -1,28 +1,384 @@
 import os
-import requests
-from PyQt6.QtWidgets import QMessageBox
-from isbnlib import meta
+import json
+import time
+import sqlite3
+import threading
+from pathlib import Path
 
-GOOGLE_BOOKS_API = "https://www.googleapis.com/books/v1/volumes?q="
+import perf
+from utils import normalize_isbn, is_valid_isbn, to_isbn13
 
-def fetch_book_info(query):
-    key = os.getenv("GOOGLE_BOOKS_API_KEY")
-    if not key:
-        QMessageBox.critical(None, "Config Error", "Please set GOOGLE_BOOKS_API_KEY in .env")
-        return None
-    url = f"{GOOGLE_BOOKS_API}{query}&maxResults=40&key={key}"
-    try:
-        r = requests.get(url)
+# requests and isbnlib are imported on first use: they dominate start-up time
+# and nothing needs them until the first search or ISBN lookup
+
+GOOGLE_BOOKS_API = "https://www.googleapis.com/books/v1/volumes"
+PAGE_SIZE = 40   # Google's maximum maxResults
+CACHE_FILE = Path("api_cache.db")
+
+# Partial responses: only the attributes the UI renders or stores
+VOLUME_FIELDS = (
+    "id,volumeInfo(title,authors,categories,averageRating,publishedDate,"
+    "pageCount,description,imageLinks/thumbnail,industryIdentifiers)"
+)
+SEARCH_FIELDS = f"totalItems,items({VOLUME_FIELDS})"
+
+
+class ApiError(Exception):
+    """Raised instead of showing a dialog, so callers on any thread can report it."""
+
+    title = "API Error"
+
+    def __init__(self, message, title=None):
+        super().__init__(message)
+        if title:
+            self.title = title
+
+
+class ConfigError(ApiError):
+    title = "Config Error"
+
+
+class ResponseCache:
+    """SQLite-backed store of API responses with a TTL and LRU eviction.
+
+    Entries older than ``ttl`` seconds are treated as misses but kept around,
+    so they can still be served when the network is unavailable.
+    """
+
+    def __init__(self, path=CACHE_FILE, ttl=7 * 24 * 3600, max_entries=5000):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(path), check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            " key TEXT PRIMARY KEY, value TEXT NOT NULL,"
+            " created REAL NOT NULL, accessed REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS responses_accessed ON responses(accessed)")
+        self._conn.commit()
+
+    def get(self, key, allow_stale=False):
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, created FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None or (not allow_stale and now - row[1] > self.ttl):
+                self.misses += 1
+                perf.count("cache.miss")
+                return None
+            self.hits += 1
+            perf.count("cache.hit")
+            self._conn.execute("UPDATE responses SET accessed = ? WHERE key = ?", (now, key))
+            self._conn.commit()
+        return json.loads(row[0])
+
+    def put(self, key, value):
+        self.put_many([(key, value)])
+
+    def put_many(self, entries):
+        now = time.time()
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO responses (key, value, created, accessed) VALUES (?, ?, ?, ?)",
+                [(key, json.dumps(value), now, now) for key, value in entries]
+            )
+            self._evict()
+            self._conn.commit()
+
+    def _evict(self):
+        excess = self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0] - self.max_entries
+        if excess > 0:
+            self._conn.execute(
+                "DELETE FROM responses WHERE key IN"
+                " (SELECT key FROM responses ORDER BY accessed LIMIT ?)", (excess,)
+            )
+
+    def values(self, prefix):
+        """All cached values whose key starts with ``prefix``, e.g. every volume ("v:")."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT value FROM responses WHERE key >= ? AND key < ?", (prefix, prefix + "\uffff")
+            ).fetchall()
+        return [json.loads(row[0]) for row in rows]
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute("DELETE FROM responses")
+            self._conn.commit()
+        self.hits = self.misses = 0
+
+    def stats(self):
+        with self._lock:
+            entries = self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+        return {"hits": self.hits, "misses": self.misses, "entries": entries}
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+def configure_cache(path=CACHE_FILE, ttl=None, max_entries=None):
+    """Replace the module cache, e.g. with settings from config.json."""
+    global _cache
+    kwargs = {k: v for k, v in (("ttl", ttl), ("max_entries", max_entries)) if v is not None}
+    with _cache_lock:
+        if _cache is not None:
+            _cache.close()
+        _cache = ResponseCache(path, **kwargs)
+    return _cache
+
+def get_cache():
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = ResponseCache()
+        return _cache
+
+_volume_listeners = []
+
+def on_volumes(callback):
+    """Call ``callback(items)`` with every batch of volumes fetched or served from the cache.
+
+    Callbacks run on whichever thread made the request.
+    """
+    _volume_listeners.append(callback)
+
+def announce_volumes(items):
+    """Pass volume items to the on_volumes listeners; for volumes converted from other services."""
+    for callback in _volume_listeners:
+        callback(items)
+
+
+def query_key(query, start_index=0):
+    key = "q:" + " ".join(query.lower().split())
+    return f"{key}@{start_index}" if start_index else key
+
+def volume_key(volume_id):
+    return "v:" + volume_id
+
+def isbn_key(isbn, service):
+    return f"i:{service}:{isbn}"
+
+
+class GoogleBooksClient:
+    """Google Books client sharing one keep-alive session across all requests.
+
+    The session pools connections per host, retries idempotent requests with
+    exponential backoff and asks for gzip; search and volume requests use a
+    ``fields`` projection so only rendered attributes are downloaded.
+    """
+
+    def __init__(self, api_key=None, base_url=None, timeout=(3.05, 15),
+                 retries=3, backoff=0.5, pool_size=8):
+        self.api_key = api_key
+        # GOOGLE_BOOKS_API_URL points the app at a stand-in server (see benchmarks/)
+        base_url = base_url or os.getenv("GOOGLE_BOOKS_API_URL") or GOOGLE_BOOKS_API
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+        import requests
+        from requests.adapters import HTTPAdapter
+        from urllib3.util.retry import Retry
+        self.session = requests.Session()
+        retry = Retry(
+            total=retries, backoff_factor=backoff,
+            status_forcelist=(429, 500, 502, 503, 504),
+            allowed_methods=frozenset(["GET"]), raise_on_status=False
+        )
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        # Google only compresses for user agents that mention gzip
+        self.session.headers.update({
+            "Accept-Encoding": "gzip, deflate",
+            "User-Agent": "BookTracker/1.0 (gzip)",
+        })
+
+    def _key(self):
+        key = self.api_key or os.getenv("GOOGLE_BOOKS_API_KEY")
+        if not key:
+            raise ConfigError("Please set GOOGLE_BOOKS_API_KEY in .env")
+        return key
+
+    def _get(self, url, params=None):
+        import requests
+        try:
+            with perf.span("http.get"):
+                r = self.session.get(url, params=params, timeout=self.timeout)
+        except requests.RequestException as e:
+            perf.count("http.errors")
+            raise ApiError(f"{e}", "Network Error") from e
+        perf.count("http.requests")
+        perf.count("http.bytes", len(r.content))
         if r.status_code == 200:
-            return r.json()
-        QMessageBox.warning(None, "API Error", "Failed to fetch results.")
-    except requests.RequestException as e:
-        QMessageBox.warning(None, "Network Error", f"{e}")
-    return None
-
-def lookup_by_isbn(isbn):
-    try:
-        info = meta(isbn, service="goob")
-        return info.get("Title", "Unknown Title")
-    except:
-        return None
\ No newline at end of file
+            return r
+        raise ApiError("Failed to fetch results.")
+
+    def search(self, query, max_results=PAGE_SIZE, start_index=0):
+        params = {
+            "q": query, "startIndex": start_index, "maxResults": max_results,
+            "fields": SEARCH_FIELDS, "key": self._key()
+        }
+        return self._get(self.base_url, params).json()
+
+    def volume(self, volume_id):
+        params = {"fields": VOLUME_FIELDS, "key": self._key()}
+        return self._get(f"{self.base_url}/{volume_id}", params).json()
+
+    def download(self, url):
+        return self._get(url).content
+
+    def close(self):
+        self.session.close()
+
+
+_client = None
+_client_lock = threading.Lock()
+
+def configure_client(**kwargs):
+    """Replace the shared client, e.g. to change timeouts or point at another server."""
+    global _client
+    with _client_lock:
+        if _client is not None:
+            _client.close()
+        _client = GoogleBooksClient(**kwargs)
+    return _client
+
+def get_client():
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = GoogleBooksClient()
+        return _client
+
+
+def _cached(key, fetch, remember_items=False):
+    cache = get_cache()
+    data = cache.get(key)
+    if data is None:
+        try:
+            data = fetch()
+        except ApiError:
+            # Offline or failing: fall back to whatever we saw last
+            data = cache.get(key, allow_stale=True)
+            if data is None:
+                raise
+        else:
+            entries = [(key, data)]
+            if remember_items:
+                entries += [(volume_key(item["id"]), item) for item in data.get("items", []) if "id" in item]
+            cache.put_many(entries)
+    # Cache-served volumes are announced too, so a fresh catalog still learns them
+    if remember_items and data.get("items"):
+        announce_volumes(data["items"])
+    return data
+
+@perf.timed("api.search")
+def fetch_book_info(query, start_index=0):
+    """One page of search results, starting at ``start_index``."""
+    client = get_client()
+    return _cached(
+        query_key(query, start_index),
+        lambda: client.search(query, start_index=start_index), remember_items=True
+    )
+
+def fetch_volume(volume_id):
+    client = get_client()
+    return _cached(volume_key(volume_id), lambda: client.volume(volume_id))
+
+def fetch_json(url, params=None):
+    """A JSON document from a service other than Google Books, through the shared session and cache."""
+    params = params or {}
+    key = "u:" + url + "?" + "&".join(f"{k}={v}" for k, v in sorted(params.items()))
+    client = get_client()
+    return _cached(key, lambda: client._get(url, params).json())
+
+def fetch_cover(url):
+    return get_client().download(url)
+
+def isbn_volume(record):
+    """Turn an isbnlib metadata record into a Google-style volume item."""
+    isbn13 = record.get("ISBN-13", "")
+    info = {
+        "title": record.get("Title", "Unknown Title"),
+        "authors": record.get("Authors", []),
+        "publishedDate": record.get("Year", ""),
+        "publisher": record.get("Publisher", ""),
+        "industryIdentifiers": [{"type": "ISBN_13", "identifier": isbn13}] if isbn13 else [],
+    }
+    return {"id": f"isbn:{isbn13}", "volumeInfo": {k: v for k, v in info.items() if v}}
+
+def meta(isbn, service="goob"):
+    from isbnlib import meta
+    return meta(isbn, service=service)
+
+_isbn_memo = {}   # only successful lookups, so transient failures are retried
+
+def _lookup_isbn13(isbn13, service):
+    key = isbn_key(isbn13, service)
+    item = _isbn_memo.get(key)
+    if item is not None:
+        return item
+    item = get_cache().get(key)
+    if item is None:
+        try:
+            record = meta(isbn13, service=service)
+        except Exception:
+            return None
+        if not record:
+            return None
+        item = isbn_volume(record)
+        get_cache().put(key, item)
+    announce_volumes([item])
+    _isbn_memo[key] = item
+    return item
+
+def lookup_by_isbn(isbn, service="goob"):
+    """Resolve an ISBN to a Google-style volume item, or None.
+
+    Anything that fails the local ISBN-10/13 checksum returns None without a
+    network call; answers are memoized in memory and in the response cache.
+    """
+    if not is_valid_isbn(isbn):
+        return None
+    return _lookup_isbn13(to_isbn13(normalize_isbn(isbn)), service)
+
+def _cached_isbnlib(key, call):
+    # Failures are not cached, so a flaky service is asked again next time
+    cache = get_cache()
+    value = cache.get(key)
+    if value is None:
+        try:
+            value = call()
+        except Exception:
+            return None
+        cache.put(key, value)
+    return value
+
+def editions(isbn):
+    """ISBN-13s of other editions of ``isbn`` from isbnlib's merged services (may be empty)."""
+    if not is_valid_isbn(isbn):
+        return []
+    isbn13 = to_isbn13(normalize_isbn(isbn))
+
+    def call():
+        from isbnlib import editions
+        found = {to_isbn13(normalize_isbn(i)) for i in editions(isbn13, service="merge") if is_valid_isbn(i)}
+        return sorted(found - {isbn13})
+
+    return _cached_isbnlib(f"e:{isbn13}", call) or []
+
+def isbn_from_words(words):
+    """The ISBN isbnlib's web search finds for ``words`` (title and author), or ""."""
+    def call():
+        from isbnlib import isbn_from_words
+        found = isbn_from_words(words) or ""
+        return to_isbn13(found) if is_valid_isbn(found) else ""
+
+    return _cached_isbnlib("w:" + " ".join(words.lower().split()), call) or ""
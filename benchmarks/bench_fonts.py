@@ -0,0 +1,94 @@
+"""Font application over a large synthetic widget tree.
+
+Compares the old per-widget recursion (setFont on every descendant, then
+recursing into each of them again) with theme.apply_font, which sets the
+font once on the application. Prints one JSON object per tree size.
+
+    python benchmarks/bench_fonts.py --sizes 250 1000 4000 --max-ms 2000
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import tempfile
+from pathlib import Path
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from PyQt6.QtWidgets import QApplication, QWidget, QVBoxLayout, QLabel, QPushButton, QLineEdit
+from PyQt6.QtGui import QFont
+
+import theme
+
+
+def build_tree(size, depth=6):
+    """A window of roughly ``size`` widgets nested ``depth`` containers deep."""
+    root = QWidget()
+    count = 0
+    parent = root
+    per_level = max(1, size // depth)
+    for _ in range(depth):
+        container = QWidget(parent)
+        layout = QVBoxLayout(container)
+        for i in range(per_level // 3):
+            layout.addWidget(QLabel(f"Label {i}"))
+            layout.addWidget(QPushButton(f"Button {i}"))
+            layout.addWidget(QLineEdit())
+            count += 3
+        parent.layout() or QVBoxLayout(parent)
+        parent.layout().addWidget(container)
+        parent = container
+    return root, count
+
+def recursive_set_font(widget, font):
+    # The pre-fix algorithm: findChildren is already recursive
+    widget.setFont(font)
+    for child in widget.findChildren(QWidget):
+        child.setFont(font)
+        recursive_set_font(child, font)
+
+def timed(fn):
+    start = time.perf_counter()
+    fn()
+    QApplication.processEvents()
+    return (time.perf_counter() - start) * 1000
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[250, 1000, 4000])
+    parser.add_argument("--skip-recursive-above", type=int, default=2000,
+                        help="the old algorithm is too slow to time on bigger trees")
+    parser.add_argument("--max-ms", type=float, help="fail if apply_font takes longer than this")
+    args = parser.parse_args(argv)
+
+    app = QApplication.instance() or QApplication([])
+    # The compiled stylesheet goes to a throwaway cache, not the working directory
+    with tempfile.TemporaryDirectory(prefix="booktracker-bench-") as tmp:
+        theme.THEME_CACHE_DIR = Path(tmp) / "theme_cache"
+        return run(app, args)
+
+def run(app, args):
+    theme.apply_theme(app, "dark_teal.xml")   # compile into the cache outside the timings
+    app.setStyleSheet("")
+
+    failed = False
+    for n, size in enumerate(args.sizes):
+        root, count = build_tree(size)
+        root.show()
+        QApplication.processEvents()
+        result = {"benchmark": "font", "widgets": count}
+        result["apply_theme_ms"] = round(timed(lambda: theme.apply_theme(app, "dark_teal.xml")), 2)
+        result["apply_font_ms"] = round(timed(lambda: theme.apply_font(app, "DejaVu Sans", 10 + n)), 2)
+        if size <= args.skip_recursive_above:
+            font = QFont("DejaVu Serif", 12)
+            result["recursive_ms"] = round(timed(lambda: recursive_set_font(root, font)), 2)
+        print(json.dumps(result), flush=True)
+        failed |= args.max_ms is not None and result["apply_font_ms"] > args.max_ms
+        root.close()
+        root.deleteLater()
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,262 @@
+"""Local stand-in for the Google Books API and its cover host.
+
+Serves /books/v1/volumes searches, /books/v1/volumes/<id> lookups,
+Open Library style /search.json searches and /covers/<id>.png images after
+a configurable delay. Responses come from a
+replay file when one matches, otherwise they are synthesized
+deterministically from the query, so runs are reproducible offline.
+
+A replay file holds one JSON object per line:
+
+    {"path": "/books/v1/volumes?q=dune&startIndex=0", "status": 200, "body": {...}}
+    {"path": "/covers/x.png", "content_type": "image/png", "body_base64": "iVBORw0..."}
+    {"path": "/covers/y.jpg", "content_type": "image/jpeg", "body_file": "covers/y.jpg"}
+
+``body`` is JSON, served as application/json unless ``content_type`` says
+otherwise; ``body_file`` is relative to the replay file. Query parameters
+are compared as a set, ignoring ``key``, ``fields`` and ``maxResults``.
+
+``--record FILE`` appends every response served to FILE in the same
+format, so a replay file can be regenerated with one run; with
+``--upstream`` the responses come from a real service instead of being
+synthesized:
+
+    python benchmarks/fakeserver.py --record replay.jsonl --upstream https://www.googleapis.com
+
+Run standalone to point the app at it:
+
+    python benchmarks/fakeserver.py --port 8765 --latency 0.05
+    GOOGLE_BOOKS_API_URL=http://127.0.0.1:8765/books/v1/volumes \
+    OPEN_LIBRARY_SEARCH_URL=http://127.0.0.1:8765/search.json python main.py
+"""
+import json
+import time
+import base64
+import zlib
+import argparse
+import threading
+from pathlib import Path
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.error import HTTPError
+from urllib.parse import urlsplit, urlencode, parse_qsl
+from urllib.request import urlopen
+
+# 1x1 PNG
+COVER_PNG = base64.b64decode(
+    "iVBORw0KGgoAAAANSUhEUgAAAAEAAAABCAYAAAAfFcSJAAAADUlEQVR42mNk+M9QDwADhgGAWjR9awAAAABJRU5ErkJggg=="
+)
+GENRES = ("Fiction", "History", "Science", "Fantasy", "Biography", "Poetry")
+_IGNORED_PARAMS = {"key", "fields", "maxResults"}
+
+
+def _request_key(path):
+    parts = urlsplit(path)
+    params = frozenset((k, v) for k, v in parse_qsl(parts.query) if k not in _IGNORED_PARAMS)
+    return parts.path.rstrip("/"), params
+
+def _entry_body(entry, base):
+    if "body_base64" in entry:
+        return base64.b64decode(entry["body_base64"])
+    if "body_file" in entry:
+        return (base / entry["body_file"]).read_bytes()
+    return json.dumps(entry["body"]).encode()
+
+def load_replay(path):
+    """{request key: (status, content type, body bytes)} from a replay file."""
+    responses = {}
+    base = Path(path).parent
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                entry = json.loads(line)
+                responses[_request_key(entry["path"])] = (
+                    entry.get("status", 200), entry.get("content_type", "application/json"),
+                    _entry_body(entry, base),
+                )
+    return responses
+
+def replay_entry(path, status, content_type, body):
+    """The replay file line for one response; the API key is left out of the path."""
+    parts = urlsplit(path)
+    query = urlencode([(k, v) for k, v in parse_qsl(parts.query) if k != "key"])
+    entry = {"path": parts.path + (f"?{query}" if query else ""), "status": status}
+    if content_type.startswith("application/json"):
+        try:
+            entry["body"] = json.loads(body)
+            return entry
+        except ValueError:
+            pass
+    entry["content_type"] = content_type
+    entry["body_base64"] = base64.b64encode(body).decode()
+    return entry
+
+
+class FakeGoogleBooks:
+    """Threaded fake server; ``start()`` returns the base URL for configure_client()."""
+
+    def __init__(self, latency=0.0, total=200, replay=None, host="127.0.0.1", port=0,
+                 record=None, upstream=None):
+        self.latency = latency
+        self.total = total
+        self.replay = load_replay(replay) if replay else {}
+        self.record = record
+        self.upstream = upstream.rstrip("/") if upstream else None
+        self.requests = 0
+        self._recorded = set()
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer((host, port), self._handler())
+        self._server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def origin(self):
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def url(self):
+        return f"{self.origin}/books/v1/volumes"
+
+    @property
+    def open_library_url(self):
+        return f"{self.origin}/search.json"
+
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self.url
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def volume(self, volume_id, query="book"):
+        """A deterministic volume item for ``volume_id``."""
+        n = zlib.crc32(volume_id.encode())
+        info = {
+            "title": f"{query.title()} {volume_id}",
+            "authors": [f"Author {n % 997}"],
+            "categories": [GENRES[n % len(GENRES)]],
+            "pageCount": 80 + n % 700,
+            "publishedDate": str(1950 + n % 75),
+            "description": f"A synthetic volume about {query}. " * 8,
+            "industryIdentifiers": [{"type": "ISBN_13", "identifier": f"979{n % 10**10:010d}"}],
+            "imageLinks": {"thumbnail": f"{self.origin}/covers/{volume_id}.png"},
+        }
+        if n % 4:
+            info["averageRating"] = 1 + n % 5
+        return {"id": volume_id, "volumeInfo": info}
+
+    def search(self, query, start, count):
+        prefix = f"{zlib.crc32(query.encode()):08x}"
+        items = [self.volume(f"{prefix}-{i}", query) for i in range(start, min(start + count, self.total))]
+        data = {"totalItems": self.total}
+        if items:
+            data["items"] = items
+        return data
+
+    def open_library(self, query, limit):
+        """Open Library search.json docs; every other one is also in the Google results."""
+        docs = []
+        for i in range(min(limit, self.total)):
+            volume_id = f"{zlib.crc32(query.encode()):08x}-{i}"
+            info = self.volume(volume_id, query)["volumeInfo"]
+            doc = {"key": f"/works/OL{i}W", "title": info["title"] if i % 2 else f"{info['title']} (OL)",
+                   "author_name": info["authors"], "first_publish_year": int(info["publishedDate"])}
+            if i % 2:
+                doc["isbn"] = [info["industryIdentifiers"][0]["identifier"]]
+            else:
+                doc["number_of_pages_median"] = info["pageCount"]
+            docs.append(doc)
+        return {"numFound": self.total, "docs": docs}
+
+    def respond(self, path):
+        """(status, content type, body bytes) for a request path."""
+        with self._lock:
+            self.requests += 1
+        key = _request_key(path)
+        if key in self.replay:
+            response = self.replay[key]
+        elif self.upstream:
+            response = self.forward(path)
+        else:
+            response = self.synthesize(path, key)
+        if self.record:
+            self._record(path, key, response)
+        return response
+
+    def forward(self, path):
+        """The upstream service's response to ``path``."""
+        try:
+            with urlopen(self.upstream + path, timeout=30) as reply:
+                return reply.status, reply.headers.get_content_type(), reply.read()
+        except HTTPError as e:
+            return e.code, e.headers.get_content_type(), e.read()
+
+    def _record(self, path, key, response):
+        line = json.dumps(replay_entry(path, *response)) + "\n"
+        with self._lock:
+            # One entry per request key, as load_replay would keep only one
+            if key in self._recorded:
+                return
+            self._recorded.add(key)
+            with open(self.record, "a", encoding="utf-8") as f:
+                f.write(line)
+
+    def synthesize(self, path, key):
+        route, params = key[0], dict(key[1])
+        if route.startswith("/covers/"):
+            return 200, "image/png", COVER_PNG
+        if route == "/books/v1/volumes":
+            query = dict(parse_qsl(urlsplit(path).query))
+            data = self.search(params.get("q", ""), int(params.get("startIndex", 0)),
+                               int(query.get("maxResults", 10)))
+            return 200, "application/json", json.dumps(data).encode()
+        if route == "/search.json":
+            data = self.open_library(params.get("q", ""), int(params.get("limit", 20)))
+            return 200, "application/json", json.dumps(data).encode()
+        if route.startswith("/books/v1/volumes/"):
+            return 200, "application/json", json.dumps(self.volume(route.rsplit("/", 1)[1])).encode()
+        return 404, "application/json", b'{"error": "not found"}'
+
+    def _handler(self):
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                if fake.latency:
+                    time.sleep(fake.latency)
+                status, content_type, body = fake.respond(self.path)
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+        return Handler
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Fake Google Books server.")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.05, help="seconds per response")
+    parser.add_argument("--total", type=int, default=200, help="totalItems per search")
+    parser.add_argument("--replay", help="JSON-lines file of recorded responses")
+    parser.add_argument("--record", help="append every response served to this replay file")
+    parser.add_argument("--upstream", help="origin to forward unreplayed requests to, e.g. https://www.googleapis.com")
+    args = parser.parse_args(argv)
+    server = FakeGoogleBooks(args.latency, args.total, args.replay, port=args.port,
+                             record=args.record, upstream=args.upstream)
+    print(f"Serving {server.start()}", flush=True)
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.stop()
+
+if __name__ == "__main__":
+    main()
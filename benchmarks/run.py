@@ -0,0 +1,320 @@
+"""Timed scenarios over synthetic libraries against the fake Google Books server.
+
+Runs in a scratch directory, so no real library, cache or config is
+touched, and writes one JSON document with per-scenario timings:
+
+    python benchmarks/run.py --sizes 10000 100000 --latency 0.05 -o results.json
+    python benchmarks/run.py --compare results.json     # ratios against an earlier run
+"""
+import os
+import sys
+import json
+import time
+import platform
+import argparse
+import tempfile
+import statistics
+from pathlib import Path
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+os.environ.setdefault("GOOGLE_BOOKS_API_KEY", "benchmark")
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from fakeserver import FakeGoogleBooks
+from synthetic import make_store
+
+SCENARIOS = {}
+
+
+def scenario(name, per_size=True):
+    """Register ``fn(ctx, run)``; returns the time to measure, or None to time the call."""
+    def register(fn):
+        SCENARIOS[name] = (fn, per_size)
+        return fn
+    return register
+
+
+class Context:
+    def __init__(self, server, size, workdir):
+        self.server = server
+        self.size = size
+        self.workdir = workdir
+        self._store = None
+        self._window = None
+        self._app = None
+
+    @property
+    def store(self):
+        if self._store is None:
+            self._store = make_store(self.workdir / f"library-{self.size}.db", self.size)
+        return self._store
+
+    @property
+    def app(self):
+        if self._app is None:
+            from PyQt6.QtWidgets import QApplication
+            self._app = QApplication.instance() or QApplication([])
+        return self._app
+
+    @property
+    def window(self):
+        if self._window is None:
+            from models import Library
+            from ui import BookTracker
+            self._window = BookTracker(self.app, Library(self.store))
+            self._window.tabs.setCurrentIndex(1)
+            self._window.tabs.setCurrentIndex(2)
+            self._window.tabs.setCurrentIndex(0)
+            self._window.show()
+            self.wait_idle()
+        return self._window
+
+    def wait_idle(self, window=None, covers=True, timeout=120):
+        """Pump the event loop until the window's background jobs are done.
+
+        With ``covers=False`` cover prefetching may still be running.
+        """
+        from PyQt6.QtCore import QEventLoop
+        deadline = time.monotonic() + timeout
+        window = window or self._window
+        engines = (window.engine, window.cover_engine) if covers else (window.engine,)
+        while time.monotonic() < deadline:
+            self.app.processEvents(QEventLoop.ProcessEventsFlag.AllEvents, 5)
+            if not any(e.busy for e in engines):
+                self.app.processEvents()
+                return
+            time.sleep(0.001)
+        raise TimeoutError("background jobs did not finish")
+
+    def close(self):
+        if self._window is not None:
+            self._window.engine.cancel_all()
+            self._window.cover_engine.cancel_all()
+            self._window.close()
+            self._window.deleteLater()
+            self.app.processEvents()
+        if self._store is not None:
+            self._store.close()
+
+
+# API
+
+@scenario("api.search.cold", per_size=False)
+def _(ctx, run):
+    from api import fetch_book_info
+    fetch_book_info(f"cold query {run} {time.time_ns()}")
+
+@scenario("api.search.cached", per_size=False)
+def _(ctx, run):
+    from api import fetch_book_info
+    fetch_book_info("cached query")
+
+@scenario("api.search.fanout", per_size=False)
+def _(ctx, run):
+    import providers
+    providers.search(f"fanout query {run} {time.time_ns()}")
+
+@scenario("api.cover.cold", per_size=False)
+def _(ctx, run):
+    from api import fetch_cover
+    fetch_cover(f"{ctx.server.origin}/covers/run{run}-{time.time_ns()}.png")
+
+# Library and config
+
+@scenario("library.load")
+def _(ctx, run):
+    from models import Library
+    Library(ctx.store)
+
+@scenario("config.load_books")
+def _(ctx, run):
+    ctx.store.load()
+
+@scenario("config.save_books")
+def _(ctx, run):
+    books = ctx.store.load()
+    books["read_later"][0]["notes"] = f"edited {run}"
+    start = time.perf_counter()
+    ctx.store.sync(books)
+    return time.perf_counter() - start
+
+@scenario("config.load_save_config", per_size=False)
+def _(ctx, run):
+    from config import load_config, save_config
+    cfg = load_config()
+    cfg["font_size"] = 10 + run % 4
+    save_config(cfg)
+
+# GUI
+
+@scenario("ui.startup")
+def _(ctx, run):
+    from models import Library
+    from ui import BookTracker
+    start = time.perf_counter()
+    window = BookTracker(ctx.app, Library(ctx.store))
+    elapsed = time.perf_counter() - start
+    ctx.wait_idle(window)   # let the index builds finish outside the timing
+    window.deleteLater()
+    return elapsed
+
+@scenario("ui.search")
+def _(ctx, run):
+    window = ctx.window
+    start = time.perf_counter()
+    window.search_input.setText(f"ui search {run} {time.time_ns()}")
+    window.search_books()
+    ctx.wait_idle(covers=False)
+    elapsed = time.perf_counter() - start
+    ctx.wait_idle()
+    return elapsed
+
+@scenario("ui.details")
+def _(ctx, run):
+    window = ctx.window
+    if window.search_proxy.rowCount() <= run:
+        window.search_input.setText("details")
+        window.search_books()
+        ctx.wait_idle()
+    start = time.perf_counter()
+    window.search_results_list.setCurrentIndex(window.search_proxy.index(run, 0))
+    window.show_book_details()
+    ctx.wait_idle()
+    return time.perf_counter() - start
+
+@scenario("ui.filter_by_genre")
+def _(ctx, run):
+    window = ctx.window
+    if window.genre_combo.count() < 2:
+        window.search_input.setText("genres")
+        window.search_books()
+        ctx.wait_idle()
+    start = time.perf_counter()
+    window.genre_combo.setCurrentIndex(1 + run % (window.genre_combo.count() - 1))
+    window.genre_combo.setCurrentIndex(0)
+    return time.perf_counter() - start
+
+@scenario("ui.add_move_remove")
+def _(ctx, run):
+    window = ctx.window
+    if not window.search_proxy.rowCount():
+        window.search_input.setText("shelf")
+        window.search_books()
+        ctx.wait_idle()
+    start = time.perf_counter()
+    window.search_results_list.setCurrentIndex(window.search_proxy.index(run, 0))
+    window.add_to_read_later()
+    model = window.read_later_model
+    while model.canFetchMore():
+        model.fetchMore()
+    window.read_later_list.setCurrentIndex(model.index(model.rowCount() - 1, 0))
+    window.move_to_read()
+    model = window.read_books_model
+    while model.canFetchMore():
+        model.fetchMore()
+    window.read_books_list.setCurrentIndex(model.index(model.rowCount() - 1, 0))
+    window.remove_from_read()
+    ctx.app.processEvents()
+    return time.perf_counter() - start
+
+
+def _summary(samples):
+    ms = sorted(s * 1000 for s in samples)
+    return {
+        "runs": len(ms),
+        "min_ms": round(ms[0], 3),
+        "median_ms": round(statistics.median(ms), 3),
+        "mean_ms": round(statistics.fmean(ms), 3),
+        "p95_ms": round(ms[min(len(ms) - 1, int(len(ms) * 0.95))], 3),
+    }
+
+def run_scenarios(names, sizes, runs, server, workdir):
+    results = []
+    for size in sizes:
+        ctx = Context(server, size, workdir)
+        try:
+            for name in names:
+                fn, per_size = SCENARIOS[name]
+                if not per_size and size != sizes[0]:
+                    continue
+                samples = []
+                for run in range(runs):
+                    start = time.perf_counter()
+                    measured = fn(ctx, run)
+                    samples.append(measured if measured is not None else time.perf_counter() - start)
+                result = {"scenario": name, "size": size if per_size else None, **_summary(samples)}
+                print(json.dumps(result), file=sys.stderr, flush=True)
+                results.append(result)
+        finally:
+            ctx.close()
+    return results
+
+def compare(results, baseline_path):
+    baseline = {
+        (r["scenario"], r["size"]): r
+        for r in json.loads(Path(baseline_path).read_text(encoding="utf-8"))["results"]
+    }
+    print(f"{'scenario':<24}{'size':>8}{'before ms':>12}{'after ms':>12}{'ratio':>9}", file=sys.stderr)
+    for r in results:
+        old = baseline.get((r["scenario"], r["size"]))
+        if old and old["median_ms"]:
+            ratio = r["median_ms"] / old["median_ms"]
+            size = r["size"] if r["size"] is not None else "-"
+            print(f"{r['scenario']:<24}{size!s:>8}{old['median_ms']:>12.2f}{r['median_ms']:>12.2f}"
+                  f"{ratio:>8.2f}x", file=sys.stderr)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--latency", type=float, default=0.05, help="fake server delay in seconds")
+    parser.add_argument("--replay", help="JSON-lines recorded responses for the fake server")
+    parser.add_argument("--scenario", action="append", choices=sorted(SCENARIOS),
+                        help="run only these (repeatable)")
+    parser.add_argument("-o", "--output", help="write the JSON results here instead of stdout")
+    parser.add_argument("--compare", help="earlier results file to compare medians against")
+    args = parser.parse_args(argv)
+
+    output = Path(args.output).resolve() if args.output else None
+    baseline = Path(args.compare).resolve() if args.compare else None
+    cwd = Path.cwd()
+
+    server = FakeGoogleBooks(args.latency, replay=args.replay)
+    server.start()
+    with tempfile.TemporaryDirectory(prefix="booktracker-bench-") as tmp:
+        workdir = Path(tmp)
+        os.chdir(workdir)
+        import api
+        import providers
+        api.configure_client(base_url=server.url)
+        # isbnlib's services are not faked, so only the two searchable providers take part
+        providers.configure_providers([
+            providers.GoogleBooks(), providers.OpenLibrary(base_url=server.open_library_url)
+        ])
+        results = run_scenarios(args.scenario or list(SCENARIOS), args.sizes, args.runs, server, workdir)
+        os.chdir(cwd)
+    server.stop()
+
+    document = {
+        "meta": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "latency_s": args.latency,
+            "runs": args.runs,
+            "server_requests": server.requests,
+        },
+        "results": results,
+    }
+    if baseline:
+        compare(results, baseline)
+    text = json.dumps(document, indent=2)
+    if output:
+        output.write_text(text + "\n", encoding="utf-8")
+    else:
+        print(text)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,60 @@
+"""Deterministic synthetic libraries for benchmarks and manual testing.
+
+    python benchmarks/synthetic.py 50000 library.db
+"""
+import sys
+import random
+import argparse
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from store import LibraryStore
+from models import WORDS_PER_PAGE
+
+_WORDS = (
+    "shadow river crown glass winter empire silent garden iron star ocean memory "
+    "fire clock storm paper island wolf lantern mountain secret kingdom salt bone"
+).split()
+_NAMES = "Ada Ben Chloe Dev Elif Farah Gus Hana Ivo Jun Kai Lena Milo Nia Omar Pia".split()
+_SURNAMES = "Adler Brooks Chen Diaz Eze Fox Gupta Holm Ito Jansen Khan Lund Moreau Novak".split()
+
+
+def synthetic_books(count, seed=0):
+    """``count`` book dicts in store format; the same seed gives the same books."""
+    rng = random.Random(seed)
+    for i in range(count):
+        title = " ".join(rng.choice(_WORDS).title() for _ in range(rng.randint(1, 4)))
+        book = {
+            "title": f"{title} {i}",
+            "author": f"{rng.choice(_NAMES)} {rng.choice(_SURNAMES)}",
+            "isbn": f"978{rng.randrange(10**10):010d}",
+            "word_count": rng.randint(60, 900) * WORDS_PER_PAGE,
+        }
+        if rng.random() < 0.2:
+            book["notes"] = " ".join(rng.choice(_WORDS) for _ in range(rng.randint(3, 30)))
+        yield book
+
+def make_store(path, count, read_share=0.3, seed=0):
+    """A fresh LibraryStore at ``path`` holding ``count`` synthetic books."""
+    path = Path(path)
+    path.unlink(missing_ok=True)
+    store = LibraryStore(path, legacy_file=None)
+    rng = random.Random(seed)
+    store.insert_many(
+        ("read_books" if rng.random() < read_share else "read_later", book)
+        for book in synthetic_books(count, seed)
+    )
+    return store
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Write a synthetic library database.")
+    parser.add_argument("count", type=int)
+    parser.add_argument("path", nargs="?", default="library.db")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+    make_store(args.path, args.count, seed=args.seed).close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,161 @@
+import re
+import json
+import sqlite3
+import threading
+from pathlib import Path
+
+import perf
+from api import on_volumes
+
+CATALOG_DB = Path("catalog.db")
+
+# bm25 column weights: title, authors, categories, description, notes
+WEIGHTS = (10.0, 5.0, 2.0, 1.0, 3.0)
+
+_TERM = re.compile(r"\w+")
+
+
+def fts_query(text):
+    """Turn free text into an FTS5 query: every word must match, as a prefix."""
+    return " ".join(f'"{term}"*' for term in _TERM.findall(text))
+
+
+class Catalog:
+    """Offline full-text index (SQLite FTS5) over fetched volumes and library books.
+
+    Volumes are keyed "v:<volume id>", library books "book:<id>". Each row
+    keeps its source payload (a Google-style volume item) so hits can be shown
+    without any network access.
+    """
+
+    def __init__(self, path=CATALOG_DB):
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(path), check_same_thread=False)
+        self._conn.executescript(
+            "CREATE TABLE IF NOT EXISTS docs ("
+            " id INTEGER PRIMARY KEY, key TEXT NOT NULL UNIQUE, item TEXT NOT NULL);"
+            # docs_fts rowids are docs ids
+            "CREATE VIRTUAL TABLE IF NOT EXISTS docs_fts USING fts5("
+            " title, authors, categories, description, notes,"
+            " tokenize = 'unicode61 remove_diacritics 2', prefix = '2 3');"
+        )
+        self._conn.commit()
+
+    def __len__(self):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM docs").fetchone()[0]
+
+    def _upsert(self, key, item, notes=""):
+        info = item.get("volumeInfo", {})
+        row = self._conn.execute("SELECT id FROM docs WHERE key = ?", (key,)).fetchone()
+        if row:
+            doc_id = row[0]
+            self._conn.execute("DELETE FROM docs_fts WHERE rowid = ?", (doc_id,))
+            self._conn.execute("UPDATE docs SET item = ? WHERE id = ?", (json.dumps(item), doc_id))
+        else:
+            doc_id = self._conn.execute(
+                "INSERT INTO docs (key, item) VALUES (?, ?)", (key, json.dumps(item))
+            ).lastrowid
+        self._conn.execute(
+            "INSERT INTO docs_fts (rowid, title, authors, categories, description, notes)"
+            " VALUES (?, ?, ?, ?, ?, ?)",
+            (doc_id, info.get("title", ""), " ".join(info.get("authors", [])),
+             " ".join(info.get("categories", [])), info.get("description", ""), notes)
+        )
+
+    def add_volumes(self, items):
+        """Index volume items; ones already indexed unchanged are skipped."""
+        with self._lock, self._conn:
+            for item in items:
+                if not item.get("id"):
+                    continue
+                key = f"v:{item['id']}"
+                row = self._conn.execute("SELECT item FROM docs WHERE key = ?", (key,)).fetchone()
+                if row is None or json.loads(row[0]) != item:
+                    self._upsert(key, item)
+
+    @staticmethod
+    def _book_item(book):
+        info = {"title": book.title, "authors": book.authors}
+        if book.categories:
+            info["categories"] = book.categories
+        if book.isbn:
+            info["industryIdentifiers"] = [{"type": "ISBN_13", "identifier": book.isbn}]
+        return {"id": f"book:{book.id}", "volumeInfo": info}
+
+    def _upsert_book(self, book):
+        self._upsert(f"book:{book.id}", self._book_item(book), book.notes)
+
+    def add_book(self, book):
+        """Index a library book, including the user's notes."""
+        self.add_books([book])
+
+    def add_books(self, books):
+        with self._lock, self._conn:
+            for book in books:
+                self._upsert_book(book)
+
+    def remove_book(self, book_id):
+        key = f"book:{book_id}"
+        with self._lock, self._conn:
+            row = self._conn.execute("SELECT id FROM docs WHERE key = ?", (key,)).fetchone()
+            if row:
+                self._conn.execute("DELETE FROM docs_fts WHERE rowid = ?", row)
+                self._conn.execute("DELETE FROM docs WHERE id = ?", row)
+
+    def sync_library(self, library):
+        """Make the book rows match ``library``, e.g. after the CLI or importer changed it.
+
+        Only rows that are missing, stale or for removed books are written.
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT docs.key, docs.item, docs_fts.notes FROM docs"
+                " JOIN docs_fts ON docs_fts.rowid = docs.id WHERE docs.key >= 'book:' AND docs.key < 'book;'"
+            ).fetchall()
+        indexed = {key: (json.loads(item), notes) for key, item, notes in rows}
+        with self._lock, self._conn:
+            for book in list(library):
+                key = f"book:{book.id}"
+                if indexed.pop(key, None) != (self._book_item(book), book.notes) and book.id in library:
+                    self._upsert_book(book)
+            for key in indexed:
+                if int(key[5:]) not in library:
+                    self._conn.execute(
+                        "DELETE FROM docs_fts WHERE rowid = (SELECT id FROM docs WHERE key = ?)", (key,)
+                    )
+                    self._conn.execute("DELETE FROM docs WHERE key = ?", (key,))
+
+    def on_library_change(self, event, book, source=None):
+        """Library subscriber keeping book rows (and their notes) current."""
+        if event == "remove":
+            self.remove_book(book.id)
+        elif event in ("add", "notes", "update"):
+            self.add_book(book)
+
+    @perf.timed("catalog.search")
+    def search(self, text, limit=50):
+        """Best-ranked volume items for ``text``, most relevant first."""
+        query = fts_query(text)
+        if not query:
+            return []
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT docs.item FROM docs_fts JOIN docs ON docs.id = docs_fts.rowid"
+                f" WHERE docs_fts MATCH ? ORDER BY bm25(docs_fts, {', '.join(map(str, WEIGHTS))})"
+                " LIMIT ?", (query, limit)
+            ).fetchall()
+        return [json.loads(row[0]) for row in rows]
+
+
+_catalog = None
+_catalog_lock = threading.Lock()
+
+def get_catalog():
+    """The shared catalog; it subscribes to every volume the API fetches."""
+    global _catalog
+    with _catalog_lock:
+        if _catalog is None:
+            _catalog = Catalog()
+            on_volumes(_catalog.add_volumes)
+        return _catalog
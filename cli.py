@@ -0,0 +1,209 @@
+import csv
+import sys
+import json
+import argparse
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+
+from api import ApiError, configure_cache
+from models import SearchResult, Library
+from store import COLLECTIONS, COLUMNS, get_store
+from utils import format_reading_time, is_valid_isbn, normalize_isbn
+import importer
+import enrich
+import providers
+
+# Headless front end over the same core the GUI uses: api, store, models, importer.
+# Nothing here imports Qt, so it runs on servers and in batch jobs.
+
+
+def _emit(args, rows, text):
+    """Print ``rows`` as JSON with --json, else one line per row via ``text``."""
+    if args.json:
+        json.dump(rows, sys.stdout, indent=2, ensure_ascii=False)
+        print()
+    else:
+        for row in rows:
+            print(text(row))
+
+def _book_row(book):
+    return {"id": book.id, "collection": book.collection, **book.to_dict()}
+
+def _library():
+    return Library(get_store())
+
+
+def cmd_search(args):
+    skipped = {}
+
+    def run(query):
+        data = providers.search(query) or {}
+        skipped.update(data.get("configErrors", {}))
+        return [SearchResult.from_item(item) for item in data.get("items", [])[:args.limit]]
+
+    # Several queries are searched in parallel; output keeps their order
+    with ThreadPoolExecutor(max_workers=args.jobs) as pool:
+        batches = list(pool.map(run, args.query))
+    for name, message in sorted(skipped.items()):
+        print(f"{name} skipped: {message}", file=sys.stderr)
+    rows = [
+        {"query": query, "id": r.volume_id, "title": r.title, "author": r.author,
+         "rating": r.rating, "categories": r.categories}
+        for query, results in zip(args.query, batches) for r in results
+    ]
+    _emit(args, rows, lambda r: f"{r['id']}\t{r['title']} - {r['author']} - Rating: {r['rating']}")
+    return 0
+
+def cmd_list(args):
+    library = _library()
+    collections = [args.collection] if args.collection else COLLECTIONS
+    rows = [_book_row(book) for key in collections for book in library.books(key)]
+    _emit(args, rows, lambda r: (
+        f"{r['id']}\t{r['collection']}\t{r['title']} - {r['author']}"
+        f" - ETA: {format_reading_time(r['word_count'])}"
+    ))
+    return 0
+
+def cmd_add(args):
+    entries = [
+        importer.ImportEntry(n, isbn=normalize_isbn(term)) if is_valid_isbn(term)
+        else importer.ImportEntry(n, title=term)
+        for n, term in enumerate(args.book, start=1)
+    ]
+    resolved, failures = importer.resolve_entries(entries, args.jobs, args.rate)
+    report = importer.store_resolved(_library(), resolved, failures, args.shelf)
+    _emit(args, [_book_row(book) for book in report.added],
+          lambda r: f"{r['id']}\t{r['collection']}\t{r['title']} - {r['author']}")
+    for entry, reason in report.failures:
+        print(f"{entry.label()}: {reason}", file=sys.stderr)
+    return 1 if report.failures else 0
+
+def _edit(args, change):
+    library = _library()
+    missing = [book_id for book_id in args.id if book_id not in library]
+    if missing:
+        print(f"No book with id {', '.join(map(str, missing))}", file=sys.stderr)
+        return 1
+    for book_id in args.id:
+        change(library, book_id)
+    return 0
+
+def cmd_move(args):
+    return _edit(args, lambda library, book_id: library.move(book_id, args.collection))
+
+def cmd_remove(args):
+    return _edit(args, lambda library, book_id: library.remove(book_id))
+
+def cmd_notes(args):
+    notes = sys.stdin.read() if args.text == "-" else args.text
+    return _edit(args, lambda library, book_id: library.set_notes(book_id, notes))
+
+def cmd_export(args):
+    library = _library()
+    books = [_book_row(book) for key in COLLECTIONS for book in library.books(key)]
+    out = open(args.output, "w", encoding="utf-8", newline="") if args.output else sys.stdout
+    try:
+        if args.format == "json":
+            json.dump(books, out, indent=2, ensure_ascii=False)
+            out.write("\n")
+        else:
+            writer = csv.DictWriter(out, ("id", "collection") + COLUMNS, extrasaction="ignore")
+            writer.writeheader()
+            writer.writerows(books)
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    return 0
+
+def cmd_import(args):
+    return importer.main([args.file, "--shelf", args.shelf, "--jobs", str(args.jobs), "--rate", str(args.rate)])
+
+def cmd_enrich(args):
+    return enrich.main((["--force"] if args.force else []) + ["--jobs", str(args.jobs), "--rate", str(args.rate)])
+
+def cmd_report(args):
+    library = _library()
+    rows = []
+    for key in COLLECTIONS:
+        words = sum(book.word_count for book in library.books(key))
+        rows.append({"collection": key, "books": len(library.books(key)), "words": words,
+                     "reading_time": format_reading_time(words)})
+    _emit(args, rows, lambda r: f"{r['collection']}\t{r['books']} books\t{r['reading_time']}")
+    return 0
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="cli.py", description="Headless BookTracker.")
+    parser.add_argument("--json", action="store_true", help="machine-readable output")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("search", help="search Google Books, Open Library and isbnlib services at once")
+    p.add_argument("query", nargs="+")
+    p.add_argument("--limit", type=int, default=10, help="results per query")
+    p.add_argument("--jobs", type=int, default=4, help="queries searched in parallel")
+    p.set_defaults(func=cmd_search)
+
+    p = sub.add_parser("list", help="list library books")
+    p.add_argument("collection", nargs="?", choices=COLLECTIONS)
+    p.set_defaults(func=cmd_list)
+
+    p = sub.add_parser("add", help="add books by ISBN or title")
+    p.add_argument("book", nargs="+")
+    p.add_argument("--shelf", choices=COLLECTIONS, default="read_later")
+    p.add_argument("--jobs", type=int, default=4, help="parallel lookups")
+    p.add_argument("--rate", type=float, default=5.0, help="max API requests per second")
+    p.set_defaults(func=cmd_add)
+
+    p = sub.add_parser("move", help="move books to another collection")
+    p.add_argument("collection", choices=COLLECTIONS)
+    p.add_argument("id", type=int, nargs="+")
+    p.set_defaults(func=cmd_move)
+
+    p = sub.add_parser("remove", help="remove books")
+    p.add_argument("id", type=int, nargs="+")
+    p.set_defaults(func=cmd_remove)
+
+    p = sub.add_parser("notes", help="replace a book's notes ('-' reads stdin)")
+    p.add_argument("id", type=int, nargs=1)
+    p.add_argument("text")
+    p.set_defaults(func=cmd_notes)
+
+    p = sub.add_parser("export", help="write the library as JSON or CSV")
+    p.add_argument("--format", choices=("json", "csv"), default="json")
+    p.add_argument("-o", "--output", help="file to write instead of stdout")
+    p.set_defaults(func=cmd_export)
+
+    p = sub.add_parser("report", help="books and reading time per collection")
+    p.set_defaults(func=cmd_report)
+
+    p = sub.add_parser("import", help="import a Goodreads export, CSV or ISBN list")
+    p.add_argument("file")
+    p.add_argument("--shelf", choices=COLLECTIONS, default="read_later",
+                   help="collection for rows without a shelf of their own")
+    p.add_argument("--jobs", type=int, default=4, help="parallel lookups")
+    p.add_argument("--rate", type=float, default=5.0, help="max API requests per second")
+    p.set_defaults(func=cmd_import)
+
+    p = sub.add_parser("enrich", help="fill in missing page counts, ISBNs and genres")
+    p.add_argument("--force", action="store_true", help="re-check books enriched before")
+    p.add_argument("--jobs", type=int, default=4, help="parallel lookups")
+    p.add_argument("--rate", type=float, default=5.0, help="max API requests per second")
+    p.set_defaults(func=cmd_enrich)
+    return parser
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+
+    from dotenv import load_dotenv
+    from config import load_config
+    load_dotenv(Path(__file__).with_name(".env"))
+    config = load_config()
+    configure_cache(ttl=config["cache_ttl_hours"] * 3600, max_entries=config["cache_max_entries"])
+    try:
+        return args.func(args)
+    except ApiError as e:
+        print(f"{e.title}: {e}", file=sys.stderr)
+        return 2
+
+if __name__ == "__main__":
+    sys.exit(main())
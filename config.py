@@ -1,29 +1,47 @@
+import os
 import json
+import time
 from pathlib import Path
+import perf
+from store import get_store
 
-BOOKS_FILE = Path("books_data.json")
 CONFIG_FILE = Path("config.json")
 
+@perf.timed("config.load_json")
 def load_json(path, default):
+    """Parse ``path``; a corrupt file is kept aside as <name>.corrupt-<time> and ``default`` returned."""
     if path.exists():
         try:
             return json.loads(path.read_text(encoding="utf-8"))
-        except json.JSONDecodeError:
+        except (json.JSONDecodeError, UnicodeDecodeError):
+            path.replace(path.with_name(f"{path.name}.corrupt-{time.strftime('%Y%m%d-%H%M%S')}"))
             return default
     return default
 
+@perf.timed("config.save_json")
 def save_json(path, data):
-    path.write_text(json.dumps(data, indent=4), encoding="utf-8")
+    """Write atomically: a crash leaves either the old file or the new one, never half of each."""
+    tmp = path.with_name(path.name + ".tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write(json.dumps(data, indent=4))
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
 
+# The library itself lives in SQLite (store.py); these keep the old whole-dict API
 def load_books():
-    return load_json(BOOKS_FILE, {"read_later": [], "read_books": []})
+    return get_store().load()
 
 def save_books(books):
-    save_json(BOOKS_FILE, books)
+    get_store().sync(books)
 
 def load_config():
-    default = {"theme": "dark_teal.xml", "font": "Arial", "font_size": 10}
-    return load_json(CONFIG_FILE, default)
+    default = {
+        "theme": "dark_teal.xml", "font": "Arial", "font_size": 10,
+        "cache_ttl_hours": 168, "cache_max_entries": 5000,
+        "search_max_results": 400
+    }
+    return {**default, **load_json(CONFIG_FILE, {})}
 
 def save_config(cfg):
     save_json(CONFIG_FILE, cfg)
\ No newline at end of file
@@ -0,0 +1,140 @@
+import time
+import sqlite3
+import hashlib
+import threading
+from pathlib import Path
+from PyQt6.QtCore import Qt, QSize
+from PyQt6.QtGui import QImage, QPixmap, QPixmapCache
+
+import perf
+from api import fetch_cover
+
+COVERS_DIR = Path("cover_cache")
+COVER_SIZE = QSize(200, 300)
+
+# Decoded, already scaled covers; QPixmapCache limits are in KiB
+QPixmapCache.setCacheLimit(64 * 1024)
+
+
+class CoverStore:
+    """On-disk image store addressed by content hash, with LRU eviction by size.
+
+    URLs map to the SHA-256 of the bytes they returned, so editions that
+    share a cover image are stored once.
+    """
+
+    def __init__(self, root=COVERS_DIR, max_bytes=200 * 1024 * 1024):
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.root / "index.db"), check_same_thread=False)
+        self._conn.executescript(
+            "CREATE TABLE IF NOT EXISTS urls ("
+            " url TEXT PRIMARY KEY, digest TEXT NOT NULL, accessed REAL NOT NULL);"
+            "CREATE INDEX IF NOT EXISTS urls_accessed ON urls(accessed);"
+            "CREATE TABLE IF NOT EXISTS blobs (digest TEXT PRIMARY KEY, size INTEGER NOT NULL);"
+        )
+        self._conn.commit()
+
+    def _path(self, digest):
+        return self.root / digest[:2] / digest
+
+    def get(self, url):
+        with self._lock:
+            row = self._conn.execute("SELECT digest FROM urls WHERE url = ?", (url,)).fetchone()
+            if row is None:
+                return None
+            try:
+                data = self._path(row[0]).read_bytes()
+            except OSError:
+                self._conn.execute("DELETE FROM urls WHERE url = ?", (url,))
+                self._conn.commit()
+                return None
+            self._conn.execute("UPDATE urls SET accessed = ? WHERE url = ?", (time.time(), url))
+            self._conn.commit()
+            return data
+
+    def put(self, url, data):
+        digest = hashlib.sha256(data).hexdigest()
+        path = self._path(digest)
+        with self._lock:
+            if not path.exists():
+                path.parent.mkdir(exist_ok=True)
+                path.write_bytes(data)
+            self._conn.execute("INSERT OR REPLACE INTO blobs (digest, size) VALUES (?, ?)", (digest, len(data)))
+            self._conn.execute(
+                "INSERT OR REPLACE INTO urls (url, digest, accessed) VALUES (?, ?, ?)",
+                (url, digest, time.time())
+            )
+            self._evict()
+            self._conn.commit()
+        return digest
+
+    def _evict(self):
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM blobs").fetchone()[0]
+        while total > self.max_bytes:
+            oldest = self._conn.execute("SELECT url FROM urls ORDER BY accessed LIMIT 1").fetchone()
+            if oldest is None:
+                break
+            self._conn.execute("DELETE FROM urls WHERE url = ?", oldest)
+            orphans = self._conn.execute(
+                "SELECT digest, size FROM blobs WHERE digest NOT IN (SELECT digest FROM urls)"
+            ).fetchall()
+            for digest, size in orphans:
+                self._path(digest).unlink(missing_ok=True)
+                self._conn.execute("DELETE FROM blobs WHERE digest = ?", (digest,))
+                total -= size
+
+
+_store = None
+_store_lock = threading.Lock()
+
+def get_store():
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = CoverStore()
+        return _store
+
+
+def cache_key(url, size=COVER_SIZE):
+    return f"{url}@{size.width()}x{size.height()}"
+
+def cached_pixmap(url, size=COVER_SIZE):
+    """Return the scaled cover if it is already decoded in memory, else None."""
+    return QPixmapCache.find(cache_key(url, size))
+
+def remember_pixmap(url, image, size=COVER_SIZE):
+    """Convert a worker-scaled QImage on the GUI thread and keep it in memory."""
+    with perf.span("cover.to_pixmap"):
+        pix = QPixmap.fromImage(image)
+    QPixmapCache.insert(cache_key(url, size), pix)
+    return pix
+
+def load_cover(url, size=COVER_SIZE):
+    """Worker side: disk store or network, then decode and scale to a QImage.
+
+    Returns None if the cover cannot be fetched or decoded.
+    """
+    store = get_store()
+    data = store.get(url)
+    fresh = data is None
+    if fresh:
+        try:
+            with perf.span("cover.download"):
+                data = fetch_cover(url)
+        except Exception:
+            return None
+    else:
+        perf.count("cover.disk_hits")
+    with perf.span("cover.decode"):
+        image = QImage.fromData(data)
+        if image.isNull():
+            return None
+        image = image.scaled(
+            size, Qt.AspectRatioMode.KeepAspectRatio, Qt.TransformationMode.SmoothTransformation
+        )
+    if fresh:
+        store.put(url, data)
+    return image
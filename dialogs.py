@@ -1,6 +1,11 @@
-from PyQt6.QtWidgets import QDialog, QVBoxLayout, QLabel, QComboBox, QFontComboBox, QPushButton
+from PyQt6.QtWidgets import (
+    QDialog, QVBoxLayout, QHBoxLayout, QLabel, QComboBox, QFontComboBox, QPushButton,
+    QTableWidget, QTableWidgetItem, QHeaderView, QFileDialog
+)
 from PyQt6.QtGui import QFont
-from qt_material import apply_stylesheet
+from PyQt6.QtCore import QTimer
+
+import perf
 
 THEMES = [
     "dark_teal.xml","light_blue.xml","dark_amber.xml","dark_purple.xml",
@@ -58,6 +63,87 @@ class PreferencesDialog(QDialog):
         p.config["font_size"] = int(self.size_combo.currentText())
         from config import save_config
         save_config(p.config)
-        apply_stylesheet(p.app, theme=p.config["theme"])
-        p.set_font(p.config["font"], p.config["font_size"])
-        self.accept()
\ No newline at end of file
+        p.apply_saved_theme()
+        self.accept()
+
+class DiagnosticsDialog(QDialog):
+    """Live view of perf spans and counters, refreshed every second."""
+
+    REFRESH_MS = 1000
+    SPAN_COLUMNS = ("Span", "Count", "Mean ms", "p50 ms", "p95 ms", "Max ms")
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Diagnostics")
+        self.resize(640, 480)
+        layout = QVBoxLayout()
+
+        self.spans = QTableWidget(0, len(self.SPAN_COLUMNS))
+        self.spans.setHorizontalHeaderLabels(self.SPAN_COLUMNS)
+        self.spans.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
+        self.spans.verticalHeader().setVisible(False)
+        self.spans.horizontalHeader().setSectionResizeMode(0, QHeaderView.ResizeMode.Stretch)
+
+        self.counters = QTableWidget(0, 2)
+        self.counters.setHorizontalHeaderLabels(("Counter", "Value"))
+        self.counters.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
+        self.counters.verticalHeader().setVisible(False)
+        self.counters.horizontalHeader().setSectionResizeMode(0, QHeaderView.ResizeMode.Stretch)
+
+        buttons = QHBoxLayout()
+        reset = QPushButton("Reset")
+        reset.clicked.connect(self._reset)
+        export = QPushButton("Export Trace...")
+        export.clicked.connect(self._export)
+        buttons.addWidget(reset)
+        buttons.addWidget(export)
+
+        layout.addWidget(QLabel("Timings (percentiles over the last samples):"))
+        layout.addWidget(self.spans, 3)
+        layout.addWidget(QLabel("Counters:"))
+        layout.addWidget(self.counters, 1)
+        layout.addLayout(buttons)
+        self.setLayout(layout)
+
+        self._timer = QTimer(self)
+        self._timer.timeout.connect(self.refresh)
+
+    def showEvent(self, event):
+        self.refresh()
+        self._timer.start(self.REFRESH_MS)
+        super().showEvent(event)
+
+    def hideEvent(self, event):
+        self._timer.stop()
+        super().hideEvent(event)
+
+    @staticmethod
+    def _fill(table, rows):
+        table.setRowCount(len(rows))
+        for r, row in enumerate(rows):
+            for c, value in enumerate(row):
+                text = f"{value:.2f}" if isinstance(value, float) else str(value)
+                item = table.item(r, c)
+                if item is None:
+                    table.setItem(r, c, QTableWidgetItem(text))
+                else:
+                    item.setText(text)
+
+    def refresh(self):
+        snap = perf.snapshot()
+        self._fill(self.spans, [
+            (name, s["count"], s["mean_ms"], s["p50_ms"], s["p95_ms"], s["max_ms"])
+            for name, s in sorted(snap["spans"].items())
+        ])
+        self._fill(self.counters, sorted(snap["counters"].items()))
+
+    def _reset(self):
+        perf.reset()
+        self.refresh()
+
+    def _export(self):
+        path, _ = QFileDialog.getSaveFileName(
+            self, "Export Trace", "booktracker-trace.json", "Chrome trace (*.json)"
+        )
+        if path:
+            perf.export_trace(path)
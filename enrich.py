@@ -0,0 +1,199 @@
+import sys
+import datetime
+import argparse
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from api import fetch_book_info, editions, isbn_from_words
+from models import WORDS_PER_PAGE, estimate_words
+from importer import RateLimiter
+from utils import volume_isbn
+
+# How much a page count is trusted, by where it was found
+CONFIDENCE = {
+    "stored": 0.9,     # the page count Google gave when the book was added
+    "isbn": 0.9,       # Google's volume for the book's own ISBN
+    "edition": 0.7,    # another edition of the same work
+    "title": 0.5,      # a title/author search match
+    "none": 0.0,
+}
+MAX_EDITIONS = 3       # other editions tried per book
+RETRY_DAYS = 30        # books nothing was found for are looked up again after this
+
+
+class Enrichment:
+    """The changes found for one book, ready for Library.update_many()."""
+
+    __slots__ = ("book", "fields", "filled", "source", "confidence")
+
+    def __init__(self, book, fields, filled, source, confidence):
+        self.book = book
+        self.fields = fields
+        self.filled = filled   # names of what was missing or improved, e.g. ["isbn", "pages"]
+        self.source = source
+        self.confidence = confidence
+
+
+def _record(book):
+    return book.extra.get("enrichment", {})
+
+def needs_enrichment(book, force=False):
+    """True if ``book`` has not been checked, or was checked long ago without result."""
+    record = _record(book)
+    if force or not record:
+        return True
+    if record.get("confidence"):
+        return False
+    checked = datetime.date.fromisoformat(record.get("checked", "1970-01-01"))
+    return (datetime.date.today() - checked).days >= RETRY_DAYS
+
+
+def _volumes(query, limiter):
+    limiter.wait()
+    data = fetch_book_info(query) or {}
+    return [item.get("volumeInfo", {}) for item in data.get("items", [])]
+
+def _same_book(info, book):
+    title = " ".join(book.title.casefold().split())
+    found = " ".join(info.get("title", "").casefold().split())
+    if not title or not (found.startswith(title) or title.startswith(found)):
+        return False
+    surnames = {a.split()[-1].casefold() for a in book.authors}
+    return not surnames or any(a.split()[-1].casefold() in surnames for a in info.get("authors", []) if a)
+
+def _by_isbn(isbn, limiter):
+    volumes = _volumes(f"isbn:{isbn}", limiter)
+    return next((v for v in volumes if v.get("pageCount")), volumes[0] if volumes else None)
+
+def find_volume(book, limiter):
+    """(volumeInfo, source) with the best page count found for ``book``, or (None, "none")."""
+    # A match without a page count can still supply an ISBN or genres
+    fallback = (None, "none")
+    if book.isbn:
+        info = _by_isbn(book.isbn, limiter)
+        if info and info.get("pageCount"):
+            return info, "isbn"
+        if info:
+            fallback = (info, "isbn")
+        limiter.wait()
+        for other in editions(book.isbn)[:MAX_EDITIONS]:
+            info = _by_isbn(other, limiter)
+            if info and info.get("pageCount"):
+                return info, "edition"
+
+    if book.title:
+        query = f"intitle:{book.title}" + (f" inauthor:{book.authors[0]}" if book.authors else "")
+        matches = [v for v in _volumes(query, limiter) if _same_book(v, book)]
+        info = next((v for v in matches if v.get("pageCount")), None)
+        if info:
+            return info, "title"
+        if not book.isbn:
+            limiter.wait()
+            isbn = isbn_from_words(f"{book.title} {book.author}")
+            info = _by_isbn(isbn, limiter) if isbn else None
+            if info and _same_book(info, book):
+                return info, "title"
+        if matches and fallback[0] is None:
+            fallback = (matches[0], "title")
+    return fallback
+
+def enrich_book(book, limiter):
+    """Look up what ``book`` is missing; returns an Enrichment (possibly with no changes).
+
+    Only the keys found go in ``fields["extra"]``; they are merged into the
+    book's extra when stored, so edits made meanwhile are kept.
+    """
+    extra = {}   # the extra keys to set
+    fields, filled = {}, []
+    pages = book.extra.get("pages", 0)
+    source = _record(book).get("source")
+    if not pages and book.word_count and not source:
+        # Added before page counts were kept: the word count is Google's pages * WORDS_PER_PAGE
+        pages = extra["pages"] = book.word_count // WORDS_PER_PAGE
+    source = source or ("stored" if pages else "none")
+
+    if CONFIDENCE[source] < CONFIDENCE["isbn"] or not (book.isbn and book.categories):
+        info, found = find_volume(book, limiter)
+        if info:
+            if not book.isbn and volume_isbn(info):
+                fields["isbn"] = volume_isbn(info)
+                filled.append("isbn")
+            if not book.categories and info.get("categories"):
+                extra["categories"] = info["categories"]
+                filled.append("categories")
+            if info.get("pageCount") and CONFIDENCE[found] > CONFIDENCE[source]:
+                pages = extra["pages"] = info["pageCount"]
+                source = found
+                filled.append("pages")
+
+    words = estimate_words(pages, extra.get("categories", book.categories))
+    if words and words != book.word_count:
+        fields["word_count"] = words
+        filled.append("word_count")
+    confidence = CONFIDENCE[source]
+    extra["enrichment"] = {
+        "source": source, "confidence": confidence, "checked": datetime.date.today().isoformat()
+    }
+    fields["extra"] = extra
+    return Enrichment(book, fields, filled, source, confidence)
+
+def enrich_books(books, jobs=4, rate=5.0, progress=None):
+    """Enrich books on a bounded pool; returns ([Enrichment], [(book, reason)])."""
+    limiter = RateLimiter(rate)
+    results, failures = [], []
+    with ThreadPoolExecutor(max_workers=jobs) as pool:
+        futures = {pool.submit(enrich_book, book, limiter): book for book in books}
+        for done, future in enumerate(as_completed(futures), start=1):
+            book = futures[future]
+            try:
+                results.append(future.result())
+            except Exception as e:
+                failures.append((book, str(e) or type(e).__name__))
+            if progress:
+                progress(done, len(books))
+    return results, failures
+
+def store_enrichments(library, results):
+    """Write every result to the library in one transaction; returns the updated books."""
+    return library.update_many([(r.book.id, r.fields) for r in results])
+
+def summary(results, failures):
+    improved = [r for r in results if r.filled]
+    by_source = {}
+    for r in results:
+        by_source[r.source] = by_source.get(r.source, 0) + 1
+    sources = ", ".join(f"{n} {s}" for s, n in sorted(by_source.items()))
+    lines = [f"Checked {len(results) + len(failures)} books: {len(improved)} improved, "
+             f"{len(failures)} failed" + (f" (page counts: {sources})." if sources else ".")]
+    lines += [f"  {book.title or book.isbn}: {reason}" for book, reason in failures]
+    return "\n".join(lines)
+
+def enrich_library(library, force=False, jobs=4, rate=5.0, progress=None):
+    books = [book for book in library if needs_enrichment(book, force)]
+    results, failures = enrich_books(books, jobs, rate, progress)
+    store_enrichments(library, results)
+    return results, failures
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Fill in missing page counts, ISBNs and genres.")
+    parser.add_argument("--force", action="store_true", help="re-check books enriched before")
+    parser.add_argument("--jobs", type=int, default=4, help="parallel lookups")
+    parser.add_argument("--rate", type=float, default=5.0, help="max API requests per second")
+    args = parser.parse_args(argv)
+
+    from dotenv import load_dotenv
+    from store import get_store
+    from models import Library
+    load_dotenv(Path(__file__).with_name(".env"))
+
+    def progress(done, total):
+        print(f"\rEnriching {done}/{total}", end="", file=sys.stderr, flush=True)
+
+    results, failures = enrich_library(Library(get_store()), args.force, args.jobs, args.rate, progress)
+    print(file=sys.stderr)
+    print(summary(results, failures))
+    return 1 if failures else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
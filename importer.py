@@ -0,0 +1,214 @@
+import csv
+import sys
+import time
+import threading
+import argparse
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from api import fetch_book_info, lookup_by_isbn
+from models import Book, estimate_words
+from store import COLLECTIONS
+
+# Goodreads "Exclusive Shelf" -> our collections
+GOODREADS_SHELVES = {"read": "read_books", "to-read": "read_later", "currently-reading": "read_later"}
+
+
+class ImportEntry:
+    """One book to import, as read from the source file."""
+
+    __slots__ = ("line", "isbn", "title", "author", "collection", "pages", "notes", "finished")
+
+    def __init__(self, line, isbn="", title="", author="", collection=None, pages=0, notes="",
+                 finished=""):
+        self.line = line
+        self.isbn = isbn
+        self.title = title
+        self.author = author
+        self.collection = collection
+        self.pages = pages
+        self.notes = notes
+        self.finished = finished
+
+    def label(self):
+        return self.isbn or f"{self.title} - {self.author}".strip(" -") or "(no ISBN or title)"
+
+
+class ImportReport:
+    def __init__(self, total=0):
+        self.total = total
+        self.added = []
+        self.duplicates = 0
+        self.failures = []   # (entry, reason)
+
+    def summary(self, max_failures=20):
+        lines = [
+            f"Imported {len(self.added)} of {self.total} books "
+            f"({self.duplicates} already in library, {len(self.failures)} failed)."
+        ]
+        for entry, reason in self.failures[:max_failures]:
+            lines.append(f"  line {entry.line}: {entry.label()}: {reason}")
+        if len(self.failures) > max_failures:
+            lines.append(f"  ... and {len(self.failures) - max_failures} more")
+        return "\n".join(lines)
+
+
+class RateLimiter:
+    """Spaces calls at least 1/rate seconds apart across all threads."""
+
+    def __init__(self, rate):
+        self.interval = 1.0 / rate if rate else 0.0
+        self._lock = threading.Lock()
+        self._next = 0.0
+
+    def wait(self):
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next)
+            self._next = start + self.interval
+        if start > now:
+            time.sleep(start - now)
+
+
+def _clean_isbn(value):
+    # Goodreads writes ISBNs as ="0439554934"
+    return "".join(c for c in (value or "") if c.isdigit() or c in "xX").upper()
+
+def _collection(shelf):
+    shelf = shelf.lower()
+    return shelf if shelf in COLLECTIONS else GOODREADS_SHELVES.get(shelf)
+
+def _date(value):
+    # Goodreads writes dates as 2023/05/14
+    parts = (value or "").replace("/", "-").split("-")
+    if len(parts) == 3 and all(p.isdigit() for p in parts):
+        return f"{int(parts[0]):04d}-{int(parts[1]):02d}-{int(parts[2]):02d}"
+    return ""
+
+def _int(value):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return 0
+
+def read_entries(path):
+    """Parse a Goodreads export, a CSV with isbn/title/author columns, or a plain ISBN list."""
+    path = Path(path)
+    text = path.read_text(encoding="utf-8-sig")
+    first = text.split("\n", 1)[0].lower()
+    if "," not in first and "isbn" not in first and "title" not in first:
+        return [
+            ImportEntry(n, isbn=_clean_isbn(line))
+            for n, line in enumerate(text.splitlines(), start=1)
+            if line.strip() and not line.lstrip().startswith("#")
+        ]
+
+    entries = []
+    for n, row in enumerate(csv.DictReader(text.splitlines()), start=2):
+        row = {(k or "").strip().lower(): (v or "").strip() for k, v in row.items()}
+        entries.append(ImportEntry(
+            n,
+            isbn=_clean_isbn(row.get("isbn13") or row.get("isbn")),
+            title=row.get("title", ""),
+            author=row.get("author", ""),
+            collection=_collection(row.get("exclusive shelf") or row.get("shelf", "")),
+            pages=_int(row.get("number of pages") or row.get("pages")),
+            notes=row.get("my review") or row.get("notes", ""),
+            finished=_date(row.get("date read") or row.get("finished")),
+        ))
+    return entries
+
+
+def _first_volume(query, limiter):
+    limiter.wait()
+    data = fetch_book_info(query)
+    items = (data or {}).get("items", [])
+    return items[0].get("volumeInfo") if items else None
+
+def resolve(entry, limiter):
+    """Find metadata for one entry; falls back to the file's own fields if the API has nothing."""
+    info = None
+    if entry.isbn:
+        info = _first_volume(f"isbn:{entry.isbn}", limiter)
+        if info is None:
+            limiter.wait()
+            item = lookup_by_isbn(entry.isbn)
+            if item:
+                info = item["volumeInfo"]
+    elif entry.title:
+        query = f"intitle:{entry.title}" + (f" inauthor:{entry.author}" if entry.author else "")
+        info = _first_volume(query, limiter)
+
+    if info is not None:
+        book = Book.from_volume(info)
+    elif entry.title:
+        book = Book(title=entry.title, author=entry.author)
+    else:
+        raise LookupError("no metadata found")
+    book.isbn = book.isbn or entry.isbn
+    if not book.word_count and entry.pages:
+        book.word_count = estimate_words(entry.pages, book.categories)
+        book.extra["pages"] = entry.pages
+    if entry.notes:
+        book.notes = entry.notes
+    if entry.finished:
+        book.extra["finished"] = entry.finished
+    return book
+
+def resolve_entries(entries, jobs=4, rate=5.0, progress=None):
+    """Resolve entries on a bounded pool; returns ([(entry, Book)], [(entry, reason)])."""
+    limiter = RateLimiter(rate)
+    resolved, failures = [], []
+    with ThreadPoolExecutor(max_workers=jobs) as pool:
+        futures = {pool.submit(resolve, entry, limiter): entry for entry in entries}
+        for done, future in enumerate(as_completed(futures), start=1):
+            entry = futures[future]
+            try:
+                resolved.append((entry, future.result()))
+            except Exception as e:
+                failures.append((entry, str(e) or type(e).__name__))
+            if progress:
+                progress(done, len(entries))
+    resolved.sort(key=lambda pair: pair[0].line)
+    failures.sort(key=lambda pair: pair[0].line)
+    return resolved, failures
+
+def store_resolved(library, resolved, failures, collection="read_later"):
+    """Write resolved books to the library in one transaction and build the report."""
+    report = ImportReport(len(resolved) + len(failures))
+    report.failures = failures
+    report.added = library.add_many(
+        [(entry.collection or collection, book) for entry, book in resolved]
+    )
+    report.duplicates = len(resolved) - len(report.added)
+    return report
+
+def import_file(path, library, collection="read_later", jobs=4, rate=5.0, progress=None):
+    resolved, failures = resolve_entries(read_entries(path), jobs, rate, progress)
+    return store_resolved(library, resolved, failures, collection)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Import books into the BookTracker library.")
+    parser.add_argument("file", help="Goodreads export, CSV or plain list of ISBNs")
+    parser.add_argument("--shelf", choices=("read_later", "read_books"), default="read_later",
+                        help="collection for rows without a shelf of their own")
+    parser.add_argument("--jobs", type=int, default=4, help="parallel lookups")
+    parser.add_argument("--rate", type=float, default=5.0, help="max API requests per second")
+    args = parser.parse_args(argv)
+
+    from dotenv import load_dotenv
+    from store import get_store
+    from models import Library
+    load_dotenv(Path(__file__).with_name(".env"))
+
+    def progress(done, total):
+        print(f"\rResolving {done}/{total}", end="", file=sys.stderr, flush=True)
+
+    report = import_file(args.file, Library(get_store()), args.shelf, args.jobs, args.rate, progress)
+    print(file=sys.stderr)
+    print(report.summary(max_failures=len(report.failures)))
+    return 1 if report.failures else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
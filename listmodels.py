@@ -0,0 +1,263 @@
+from PyQt6.QtCore import Qt, QAbstractListModel, QModelIndex, QSortFilterProxyModel, pyqtSignal
+
+from utils import format_reading_time
+
+# Rows are handed to the view in batches through fetchMore
+BATCH_SIZE = 100
+
+SORT_MODES = {
+    "Sort by Relevance": None,
+    "Sort by Title A-Z": ("title", Qt.SortOrder.AscendingOrder),
+    "Sort by Title Z-A": ("title", Qt.SortOrder.DescendingOrder),
+    "Sort by Rating Ascending": ("rating", Qt.SortOrder.AscendingOrder),
+    "Sort by Rating Descending": ("rating", Qt.SortOrder.DescendingOrder),
+}
+
+
+class _LazyListModel(QAbstractListModel):
+    """List model over ``self._rows`` that exposes rows to the view lazily.
+
+    With ``batch_size=None`` every row is exposed as soon as it is added.
+    """
+
+    def __init__(self, parent=None, batch_size=BATCH_SIZE):
+        super().__init__(parent)
+        self.batch_size = batch_size
+        self._rows = []
+        self._loaded = 0
+
+    def _window(self, available):
+        return available if self.batch_size is None else min(self.batch_size, available)
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else self._loaded
+
+    def canFetchMore(self, parent=QModelIndex()):
+        return not parent.isValid() and self._loaded < len(self._rows)
+
+    def fetchMore(self, parent=QModelIndex()):
+        if not parent.isValid():
+            self._expose_more()
+
+    def _expose_more(self):
+        count = self._window(len(self._rows) - self._loaded)
+        if count <= 0:
+            return
+        self.beginInsertRows(QModelIndex(), self._loaded, self._loaded + count - 1)
+        self._loaded += count
+        self.endInsertRows()
+
+    def _reset(self, rows):
+        self.beginResetModel()
+        self._rows = list(rows)
+        self._loaded = self._window(len(self._rows))
+        self.endResetModel()
+
+    def _append(self, rows):
+        # Rows past the loaded window are picked up by the next fetchMore
+        fully_loaded = self._loaded == len(self._rows)
+        self._rows.extend(rows)
+        if fully_loaded and rows:
+            self._expose_more()
+
+    def _remove(self, row):
+        if row < self._loaded:
+            self.beginRemoveRows(QModelIndex(), row, row)
+            del self._rows[row]
+            self._loaded -= 1
+            self.endRemoveRows()
+        else:
+            del self._rows[row]
+
+    def clear(self):
+        self._reset([])
+
+
+class SearchResultsModel(_LazyListModel):
+    """SearchResult records in relevance order; UserRole returns the record.
+
+    All received results are exposed at once so the proxy can sort and filter
+    the complete set. While ``has_more`` is set, fetchMore asks for the next
+    remote page through ``more_requested``; pages are appended as they arrive
+    with volumes already in the list dropped.
+    """
+
+    more_requested = pyqtSignal()
+
+    def __init__(self, parent=None):
+        super().__init__(parent, batch_size=None)
+        self._ids = set()
+        self.has_more = False
+        self.loading = False
+
+    def results(self):
+        return list(self._rows)
+
+    def _unique(self, results):
+        new = []
+        for r in results:
+            if r.volume_id:
+                if r.volume_id in self._ids:
+                    continue
+                self._ids.add(r.volume_id)
+            new.append(r)
+        return new
+
+    def set_results(self, results, has_more=False):
+        self._ids = set()
+        self.has_more = has_more
+        self.loading = False
+        self._reset(self._unique(results))
+
+    def append_results(self, results, has_more=False):
+        """Add a further page; returns the results that were not duplicates."""
+        new = self._unique(results)
+        self.has_more = has_more
+        self.loading = False
+        self._append(new)
+        return new
+
+    def merge_results(self, results, has_more=False):
+        """Merge a later, fuller answer for the same query; returns the results that were new or changed.
+
+        Rows already shown take the answer's copy (e.g. with genres another
+        provider filled in), new ones are added, and the answer's rows move
+        ahead of the rest in its order. Unlike append_results, a page
+        request already in flight is left alone.
+        """
+        rows = {r.volume_id: row for row, r in enumerate(self._rows) if r.volume_id}
+        changed = []
+        for r in results:
+            row = rows.get(r.volume_id)
+            if row is not None and self._rows[row].info != r.info:
+                self._rows[row] = r
+                changed.append(r)
+                index = self.index(row)
+                self.dataChanged.emit(index, index)
+        new = self._unique(results)
+        if not self.loading:
+            self.has_more = has_more
+        self._append(new)
+        self._reorder(results)
+        return changed + new
+
+    def _reorder(self, results):
+        # Results first in their order, then the rows they do not include (local matches, pages)
+        first = {r.volume_id: n for n, r in enumerate(results) if r.volume_id}
+        last = len(first)
+        order = sorted(range(len(self._rows)), key=lambda row: first.get(self._rows[row].volume_id, last))
+        if order == list(range(len(self._rows))):
+            return
+        self.layoutAboutToBeChanged.emit()
+        moved = {old: new for new, old in enumerate(order)}
+        persistent = self.persistentIndexList()
+        self.changePersistentIndexList(persistent, [self.index(moved[i.row()]) for i in persistent])
+        self._rows = [self._rows[row] for row in order]
+        self.layoutChanged.emit()
+
+    def stop_paging(self):
+        self.has_more = False
+        self.loading = False
+
+    def clear(self):
+        self.set_results([])
+
+    def canFetchMore(self, parent=QModelIndex()):
+        return not parent.isValid() and self.has_more and not self.loading
+
+    def fetchMore(self, parent=QModelIndex()):
+        if self.canFetchMore(parent):
+            self.loading = True
+            self.more_requested.emit()
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid() or index.row() >= self._loaded:
+            return None
+        result = self._rows[index.row()]
+        if role == Qt.ItemDataRole.DisplayRole:
+            return result.display_text()
+        if role == Qt.ItemDataRole.UserRole:
+            return result
+        return None
+
+
+class SearchFilterProxy(QSortFilterProxyModel):
+    """Applies the search tab's sort order and genre filter on top of SearchResultsModel."""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._genre = "All Genres"
+        self._sort_key = None
+
+    def set_genre(self, genre):
+        self._genre = genre
+        self.invalidateFilter()
+
+    def set_sort_mode(self, method):
+        mode = SORT_MODES.get(method)
+        if mode is None:
+            self._sort_key = None
+            self.sort(-1)   # back to source (relevance) order
+            return
+        self._sort_key, order = mode
+        self.sort(0, order)
+        self.invalidate()
+
+    def filterAcceptsRow(self, source_row, source_parent):
+        if self._genre == "All Genres":
+            return True
+        index = self.sourceModel().index(source_row, 0, source_parent)
+        result = index.data(Qt.ItemDataRole.UserRole)
+        return result is not None and self._genre in result.genre
+
+    def lessThan(self, left, right):
+        a = left.data(Qt.ItemDataRole.UserRole)
+        b = right.data(Qt.ItemDataRole.UserRole)
+        if self._sort_key == "title":
+            return a.title.lower() < b.title.lower()
+        # Unrated books sort last in either direction
+        missing = float("inf") if self.sortOrder() == Qt.SortOrder.AscendingOrder else float("-inf")
+        ra = float(a.rating) if a.rating != "No Rating" else missing
+        rb = float(b.rating) if b.rating != "No Rating" else missing
+        return ra < rb
+
+
+class LibraryListModel(_LazyListModel):
+    """Books of one Library collection; UserRole returns the book id."""
+
+    def __init__(self, library, collection, parent=None):
+        super().__init__(parent)
+        self.library = library
+        self.collection = collection
+        self._reset(book.id for book in library.books(collection))
+
+    def reload(self):
+        self._reset(book.id for book in self.library.books(self.collection))
+
+    def append(self, book):
+        self._append([book.id])
+
+    def remove(self, book_id, row=None):
+        """Drop ``book_id``; pass its ``row`` when known (the view's current index) to skip the search."""
+        if row is None or not 0 <= row < len(self._rows) or self._rows[row] != book_id:
+            row = self._rows.index(book_id)
+        self._remove(row)
+
+    def refresh(self):
+        """Redraw loaded rows after books changed in place."""
+        if self._loaded:
+            self.dataChanged.emit(self.index(0), self.index(self._loaded - 1))
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid() or index.row() >= self._loaded:
+            return None
+        book_id = self._rows[index.row()]
+        if role == Qt.ItemDataRole.UserRole:
+            return book_id
+        if role == Qt.ItemDataRole.DisplayRole:
+            book = self.library.get(book_id)
+            text = f"{book.title} - {book.author}"
+            if self.collection == "read_later":
+                text += f" - ETA: {format_reading_time(book.word_count)}"
+            return text
+        return None
@@ -1,9 +1,15 @@
-import sys, os
-from dotenv import load_dotenv
-from PyQt6.QtWidgets import QApplication
-from ui import BookTracker
+import sys, os, time
+
+_START = time.perf_counter()
 
 def main():
+    # --startup-time prints how long each start-up phase took, then exits
+    timing = "--startup-time" in sys.argv
+    if timing:
+        sys.argv.remove("--startup-time")
+    marks = [("start", _START)]
+
+    from dotenv import load_dotenv
     # Determine where to look for .env
     if getattr(sys, 'frozen', False):
         # Running in PyInstaller bundle
@@ -15,17 +21,34 @@ def main():
     dotenv_path = os.path.join(bundle_dir, '.env')
     load_dotenv(dotenv_path)
 
+    from PyQt6.QtWidgets import QApplication
     app = QApplication(sys.argv)
+    marks.append(("QApplication", time.perf_counter()))
+
+    from ui import BookTracker
+    marks.append(("imports", time.perf_counter()))
     win = BookTracker(app)
-    win.show()
+    marks.append(("window", time.perf_counter()))
 
-    # Apply saved theme & font after show
-    from config import save_config
+    # Theme & font go on before show so widgets are polished once
     win.apply_saved_theme()
-    font, size = win.config["font"], win.config["font_size"]
-    win.set_font(font, size)
+    marks.append(("theme", time.perf_counter()))
+    win.show()
+    app.aboutToQuit.connect(win.library.store.checkpoint)
+
+    if timing:
+        from PyQt6.QtCore import QTimer
+
+        def report():
+            marks.append(("first paint", time.perf_counter()))
+            for (_, prev), (label, t) in zip(marks, marks[1:]):
+                print(f"{label:<14}{(t - prev) * 1000:8.1f} ms", file=sys.stderr)
+            print(f"{'total':<14}{(t - _START) * 1000:8.1f} ms", file=sys.stderr)
+            app.quit()
+
+        QTimer.singleShot(0, report)
 
     sys.exit(app.exec())
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
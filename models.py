@@ -0,0 +1,320 @@
+import datetime
+
+from utils import volume_isbn
+
+WORDS_PER_PAGE = 275
+
+# Typical words per printed page where it differs a lot from WORDS_PER_PAGE
+GENRE_WORDS_PER_PAGE = {
+    "Comics & Graphic Novels": 40,
+    "Juvenile Fiction": 150,
+    "Juvenile Nonfiction": 150,
+    "Young Adult Fiction": 250,
+    "Poetry": 120,
+    "Drama": 200,
+}
+
+
+def estimate_words(pages, categories=()):
+    """Word count for ``pages`` printed pages, using the sparsest matching genre."""
+    rates = [GENRE_WORDS_PER_PAGE[c] for c in categories if c in GENRE_WORDS_PER_PAGE]
+    return pages * min(rates, default=WORDS_PER_PAGE)
+
+
+class SearchResult:
+    """One search hit, carrying the full volumeInfo so it never has to be re-fetched."""
+
+    __slots__ = ("volume_id", "info")
+
+    def __init__(self, volume_id, info):
+        self.volume_id = volume_id
+        self.info = info
+
+    @classmethod
+    def from_item(cls, item):
+        return cls(item.get("id", ""), item.get("volumeInfo", {}))
+
+    @property
+    def title(self):
+        return self.info.get("title", "Unknown Title")
+
+    @property
+    def author(self):
+        return ", ".join(self.info.get("authors", ["Unknown Author"]))
+
+    @property
+    def rating(self):
+        return self.info.get("averageRating", "No Rating")
+
+    @property
+    def categories(self):
+        return self.info.get("categories", [])
+
+    @property
+    def genre(self):
+        return ", ".join(self.info.get("categories", ["No Genre Available"]))
+
+    @property
+    def thumbnail(self):
+        return self.info.get("imageLinks", {}).get("thumbnail", "")
+
+    def display_text(self):
+        return f"{self.title} - {self.author} - Rating: {self.rating}"
+
+
+class Book:
+    """A stored library entry. Fields without a slot of their own live in ``extra``."""
+
+    __slots__ = ("id", "collection", "title", "author", "isbn", "word_count", "notes", "extra")
+
+    FIELDS = ("title", "author", "isbn", "word_count", "notes")
+
+    def __init__(self, id=None, collection="", title="", author="", isbn="",
+                 word_count=0, notes="", extra=None):
+        self.id = id
+        self.collection = collection
+        self.title = title
+        self.author = author
+        self.isbn = isbn or ""
+        self.word_count = word_count or 0
+        self.notes = notes or ""
+        self.extra = extra or {}
+
+    @classmethod
+    def from_dict(cls, data, collection=""):
+        fields = {k: data[k] for k in cls.FIELDS if k in data}
+        extra = {k: v for k, v in data.items() if k not in cls.FIELDS and k != "id"}
+        return cls(id=data.get("id"), collection=collection, extra=extra, **fields)
+
+    @classmethod
+    def from_volume(cls, info):
+        """Build a Book from a Google Books volumeInfo."""
+        categories = info.get("categories", [])
+        pages = info.get("pageCount", 0)
+        extra = {"categories": categories} if categories else {}
+        if pages:
+            extra["pages"] = pages
+        return cls(
+            title=info.get("title", ""), author=", ".join(info.get("authors", [])),
+            isbn=volume_isbn(info), word_count=estimate_words(pages, categories), extra=extra
+        )
+
+    def copy(self):
+        return Book(self.id, self.collection, self.title, self.author, self.isbn,
+                    self.word_count, self.notes, dict(self.extra))
+
+    def to_dict(self):
+        data = {"title": self.title, "author": self.author, "word_count": self.word_count}
+        if self.isbn:
+            data["isbn"] = self.isbn
+        if self.notes:
+            data["notes"] = self.notes
+        data.update(self.extra)
+        return data
+
+    @property
+    def key(self):
+        return _title_author_key(self.title, self.author)
+
+    @property
+    def authors(self):
+        return [a.strip() for a in self.author.split(",") if a.strip()]
+
+    @property
+    def categories(self):
+        return self.extra.get("categories", [])
+
+    @property
+    def pages(self):
+        """Printed page count, or one estimated from the word count."""
+        return self.extra.get("pages") or self.word_count // WORDS_PER_PAGE
+
+    @property
+    def finished(self):
+        """ISO date the book was shelved as read, or ""."""
+        return self.extra.get("finished", "")
+
+
+def _stamp_finished(book, force=False):
+    """Date a book entering read_books; returns True if it was stamped."""
+    if book.collection != "read_books" or (book.finished and not force):
+        return False
+    book.extra["finished"] = datetime.date.today().isoformat()
+    return True
+
+def _title_author_key(title, author):
+    return " ".join(title.casefold().split()), " ".join(author.casefold().split())
+
+
+class Library:
+    """The user's collections in memory, indexed by id, ISBN and (title, author).
+
+    Every mutation is written through to the backing LibraryStore, then
+    reported to subscribers as ``callback(event, book, source)`` where event is
+    "add", "move", "remove", "notes" or "update"; source is the collection a
+    moved book came from, or a copy of an updated book as it was before.
+    """
+
+    def __init__(self, store, collections=("read_later", "read_books")):
+        self.store = store
+        self._listeners = []
+        self._by_id = {}
+        self._by_isbn = {}   # isbn -> set of ids
+        self._by_key = {}    # (title, author) -> set of ids
+        self._collections = {key: {} for key in collections}  # ordered id -> Book
+        for collection, items in store.load().items():
+            for data in items:
+                self._index(Book.from_dict(data, collection))
+
+    def _index(self, book):
+        self._by_id[book.id] = book
+        self._collections.setdefault(book.collection, {})[book.id] = book
+        self._by_key.setdefault(book.key, set()).add(book.id)
+        if book.isbn:
+            self._by_isbn.setdefault(book.isbn, set()).add(book.id)
+
+    def _unindex(self, book):
+        del self._by_id[book.id]
+        del self._collections[book.collection][book.id]
+        self._by_key[book.key].discard(book.id)
+        if book.isbn:
+            self._by_isbn[book.isbn].discard(book.id)
+
+    def _rekey(self, book, old):
+        # Collection order is left alone, so list views keep their rows
+        if book.key != old.key:
+            self._by_key[old.key].discard(book.id)
+            self._by_key.setdefault(book.key, set()).add(book.id)
+        if book.isbn != old.isbn:
+            if old.isbn:
+                self._by_isbn[old.isbn].discard(book.id)
+            if book.isbn:
+                self._by_isbn.setdefault(book.isbn, set()).add(book.id)
+
+    def subscribe(self, callback):
+        self._listeners.append(callback)
+
+    def _notify(self, event, book, source=None):
+        for callback in self._listeners:
+            callback(event, book, source)
+
+    def __len__(self):
+        return len(self._by_id)
+
+    def __contains__(self, book_id):
+        return book_id in self._by_id
+
+    def __iter__(self):
+        return iter(list(self._by_id.values()))
+
+    def get(self, book_id):
+        return self._by_id.get(book_id)
+
+    def books(self, collection):
+        return list(self._collections.get(collection, {}).values())
+
+    def find_by_isbn(self, isbn):
+        return [self._by_id[i] for i in self._by_isbn.get(isbn, ())]
+
+    def find(self, title, author):
+        return [self._by_id[i] for i in self._by_key.get(_title_author_key(title, author), ())]
+
+    def duplicate_of(self, book, collection):
+        """An existing book in ``collection`` with the same ISBN or title and author."""
+        ids = set(self._by_key.get(book.key, ()))
+        if book.isbn:
+            ids |= self._by_isbn.get(book.isbn, set())
+        for book_id in ids:
+            if self._by_id[book_id].collection == collection:
+                return self._by_id[book_id]
+        return None
+
+    def add(self, collection, book):
+        """Store a new Book in ``collection``; returns None if it is already there."""
+        if self.duplicate_of(book, collection):
+            return None
+        book.collection = collection
+        _stamp_finished(book)
+        book.id = self.store.add(collection, book.to_dict())
+        self._index(book)
+        self._notify("add", book)
+        return book
+
+    def add_many(self, entries):
+        """Store (collection, Book) pairs in one transaction, skipping duplicates.
+
+        Returns the books that were added.
+        """
+        added, pending = [], {}
+        for collection, book in entries:
+            key = (collection, book.key)
+            if key in pending or self.duplicate_of(book, collection):
+                continue
+            book.collection = collection
+            _stamp_finished(book)
+            pending[key] = book
+            added.append(book)
+        ids = self.store.insert_many([(b.collection, b.to_dict()) for b in added])
+        for book, book_id in zip(added, ids):
+            book.id = book_id
+            self._index(book)
+        for book in added:
+            self._notify("add", book)
+        return added
+
+    def move(self, book_id, collection):
+        book = self._by_id[book_id]
+        source = book.collection
+        # Stamp a copy so the move and the finish date are stored in one transaction
+        moved = book.copy()
+        moved.collection = collection
+        stamped = _stamp_finished(moved, force=source != collection)
+        self.store.move(book_id, collection, extra=moved.extra if stamped else None)
+        book.collection = collection
+        book.extra = moved.extra
+        del self._collections[source][book_id]
+        self._collections.setdefault(collection, {})[book_id] = book
+        self._notify("move", book, source)
+        return book
+
+    def remove(self, book_id):
+        book = self._by_id[book_id]
+        self.store.remove(book_id)
+        self._unindex(book)
+        self._notify("remove", book)
+        return book
+
+    def update_many(self, changes):
+        """Apply (book_id, fields) pairs, e.g. (id, {"word_count": n}), in one transaction.
+
+        ``extra`` is merged into the book's extra dict rather than replacing
+        it, so results computed in the background keep later edits. Books
+        removed in the meantime are skipped. Returns the updated books.
+        """
+        updated, writes = [], []
+        for book_id, fields in changes:
+            book = self._by_id.get(book_id)
+            if book is None:
+                continue
+            fields = dict(fields)
+            if "extra" in fields:
+                fields["extra"] = {**book.extra, **fields["extra"]}
+            updated.append((book, fields))
+            writes.append((book_id, fields))
+        self.store.update_many(writes)
+        for i, (book, fields) in enumerate(updated):
+            old = book.copy()
+            for name, value in fields.items():
+                setattr(book, name, value)
+            self._rekey(book, old)
+            updated[i] = (book, old)
+        for book, old in updated:
+            self._notify("update", book, old)
+        return [book for book, _ in updated]
+
+    def set_notes(self, book_id, notes):
+        book = self._by_id[book_id]
+        self.store.update(book_id, notes=notes)
+        book.notes = notes
+        self._notify("notes", book)
+        return book
@@ -0,0 +1,130 @@
+import os
+import json
+import time
+import threading
+from collections import deque
+from contextlib import contextmanager
+from functools import wraps
+
+# Samples kept per span for percentiles, and trace events kept for export
+WINDOW = 512
+TRACE_EVENTS = 20000
+
+enabled = os.getenv("BOOKTRACKER_PERF", "1") != "0"
+
+
+class Histogram:
+    """Rolling window of durations (seconds) plus lifetime count and total."""
+
+    __slots__ = ("samples", "count", "total", "max")
+
+    def __init__(self, window=WINDOW):
+        self.samples = deque(maxlen=window)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def add(self, seconds):
+        self.samples.append(seconds)
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+
+    def percentile(self, q):
+        ordered = sorted(self.samples)
+        if not ordered:
+            return 0.0
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+    def summary(self):
+        """Milliseconds: lifetime count/mean/max, p50/p95 over the window."""
+        return {
+            "count": self.count,
+            "mean_ms": self.total / self.count * 1000 if self.count else 0.0,
+            "p50_ms": self.percentile(0.50) * 1000,
+            "p95_ms": self.percentile(0.95) * 1000,
+            "max_ms": self.max * 1000,
+        }
+
+
+_lock = threading.Lock()
+_spans = {}        # name -> Histogram
+_counters = {}     # name -> number
+_trace = deque(maxlen=TRACE_EVENTS)
+_origin = time.perf_counter()
+
+
+def record(name, seconds, start=None):
+    """Add a measured duration for ``name``; ``start`` is its perf_counter() start."""
+    if not enabled:
+        return
+    if start is None:
+        start = time.perf_counter() - seconds
+    with _lock:
+        hist = _spans.get(name)
+        if hist is None:
+            hist = _spans[name] = Histogram()
+        hist.add(seconds)
+        _trace.append((name, start, seconds, threading.get_ident()))
+
+@contextmanager
+def span(name):
+    """Time the enclosed block under ``name``."""
+    if not enabled:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        record(name, time.perf_counter() - start, start)
+
+def timed(name):
+    """Decorator form of span()."""
+    def decorate(fn):
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            with span(name):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorate
+
+def count(name, value=1):
+    """Add ``value`` to a counter, e.g. count("http.bytes", len(body))."""
+    if not enabled:
+        return
+    with _lock:
+        _counters[name] = _counters.get(name, 0) + value
+
+
+def snapshot():
+    """{"spans": {name: summary}, "counters": {name: value}} at this moment."""
+    with _lock:
+        spans = {name: hist.summary() for name, hist in _spans.items()}
+        counters = dict(_counters)
+    return {"spans": spans, "counters": counters}
+
+def reset():
+    with _lock:
+        _spans.clear()
+        _counters.clear()
+        _trace.clear()
+
+def export_trace(path):
+    """Write recorded spans as Chrome trace events (chrome://tracing, Perfetto)."""
+    with _lock:
+        events = list(_trace)
+        counters = dict(_counters)
+    pid = os.getpid()
+    trace = [
+        {"name": name, "cat": name.split(".", 1)[0], "ph": "X", "pid": pid, "tid": tid,
+         "ts": round((start - _origin) * 1e6, 1), "dur": round(seconds * 1e6, 1)}
+        for name, start, seconds, tid in events
+    ]
+    ts = round((time.perf_counter() - _origin) * 1e6, 1)
+    trace += [
+        {"name": name, "ph": "C", "pid": pid, "tid": 0, "ts": ts, "args": {"value": value}}
+        for name, value in counters.items()
+    ]
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"traceEvents": trace, "displayTimeUnit": "ms"}, f)
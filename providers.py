@@ -0,0 +1,256 @@
+import os
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+import perf
+from api import ConfigError, announce_volumes, fetch_book_info, fetch_json, lookup_by_isbn
+from utils import is_valid_isbn, normalize_isbn, to_isbn13, volume_isbn
+
+OPEN_LIBRARY_SEARCH = "https://openlibrary.org/search.json"
+OPEN_LIBRARY_COVERS = "https://covers.openlibrary.org/b/id/{}-M.jpg"
+CANCEL_POLL = 0.05   # seconds between checks of a search's cancel token
+
+
+class Provider:
+    """A metadata source answering searches with Google-style {"totalItems", "items"} data.
+
+    ``deadline`` is how many seconds a search waits for this provider before
+    going on without it. Stand-ins for tests only need ``name``, ``deadline``,
+    ``handles()`` and ``search()``.
+    """
+
+    name = "provider"
+    deadline = 5.0
+
+    def __init__(self, deadline=None):
+        if deadline is not None:
+            self.deadline = deadline
+
+    def handles(self, query):
+        return True
+
+    def search(self, query):
+        raise NotImplementedError
+
+
+class GoogleBooks(Provider):
+    """Google Books search; an ISBN is asked for as ``isbn:<number>``."""
+
+    name = "google"
+    deadline = 10.0
+
+    def search(self, query):
+        if is_valid_isbn(query):
+            query = f"isbn:{normalize_isbn(query)}"
+        return fetch_book_info(query)
+
+
+class IsbnService(Provider):
+    """One isbnlib metadata service (e.g. "openl", "wiki"); answers ISBN queries only."""
+
+    deadline = 6.0
+
+    def __init__(self, service, deadline=None):
+        super().__init__(deadline)
+        self.service = service
+        self.name = f"isbnlib.{service}"
+
+    def handles(self, query):
+        return is_valid_isbn(query)
+
+    def search(self, query):
+        item = lookup_by_isbn(query, self.service)
+        return {"totalItems": 1, "items": [item]} if item else {"totalItems": 0, "items": []}
+
+
+class OpenLibrary(Provider):
+    """Open Library's free-text search; ISBNs are left to IsbnService("openl")."""
+
+    name = "openlibrary"
+    deadline = 6.0
+    FIELDS = "key,title,author_name,isbn,number_of_pages_median,subject,first_publish_year,cover_i"
+
+    def __init__(self, base_url=None, limit=20, deadline=None):
+        super().__init__(deadline)
+        # OPEN_LIBRARY_SEARCH_URL points the app at a stand-in server
+        self.base_url = base_url or os.getenv("OPEN_LIBRARY_SEARCH_URL") or OPEN_LIBRARY_SEARCH
+        self.limit = limit
+
+    def handles(self, query):
+        return not is_valid_isbn(query)
+
+    def search(self, query):
+        data = fetch_json(self.base_url, {"q": query, "fields": self.FIELDS, "limit": self.limit})
+        docs = data.get("docs", [])
+        items = [self.volume(d) for d in docs]
+        # Google volumes reach the offline catalog through the cache; these are converted here
+        if items:
+            announce_volumes(items)
+        return {"totalItems": data.get("numFound", len(docs)), "items": items}
+
+    @staticmethod
+    def volume(doc):
+        """A search.json doc as a Google-style volume item."""
+        isbns = [to_isbn13(i) for i in doc.get("isbn", []) if is_valid_isbn(i)]
+        info = {
+            "title": doc.get("title", ""),
+            "authors": doc.get("author_name", []),
+            "categories": doc.get("subject", [])[:3],
+            "pageCount": doc.get("number_of_pages_median", 0),
+            "publishedDate": str(doc.get("first_publish_year", "")),
+            "industryIdentifiers": [{"type": "ISBN_13", "identifier": isbns[0]}] if isbns else [],
+            "imageLinks": {"thumbnail": OPEN_LIBRARY_COVERS.format(doc["cover_i"])} if doc.get("cover_i") else {},
+        }
+        return {"id": "ol:" + doc.get("key", "").rsplit("/", 1)[-1],
+                "volumeInfo": {k: v for k, v in info.items() if v}}
+
+
+def default_providers():
+    return [GoogleBooks(), OpenLibrary(), IsbnService("openl"), IsbnService("wiki")]
+
+_providers = None
+_providers_lock = threading.Lock()
+
+def configure_providers(providers):
+    """Replace the providers every search fans out to (None restores the defaults)."""
+    global _providers
+    with _providers_lock:
+        _providers = list(providers) if providers is not None else None
+
+def get_providers():
+    global _providers
+    with _providers_lock:
+        if _providers is None:
+            _providers = default_providers()
+        return list(_providers)
+
+
+def _title_key(info):
+    authors = info.get("authors") or [""]
+    return " ".join(info.get("title", "").casefold().split()), " ".join(authors[0].casefold().split())
+
+
+class MergedResults:
+    """Volume items from several providers, deduplicated by ISBN, then by title and first author.
+
+    The primary provider's items come first, in its order, followed by the
+    others' in the order they arrived; a duplicate fills in whatever fields
+    the first copy lacked (a cover, page count, genres...).
+    """
+
+    def __init__(self):
+        self.items = []
+        self.total = 0
+        self.primary = 0      # items from the first provider, which is the one paged
+        self.answered = []    # provider names, fastest first
+        self.errors = {}      # provider name -> message, for ConfigErrors reported with the results
+        self._rank = []       # sort key per item: (0, primary position) or (1, arrival)
+        self._by_isbn = {}
+        self._by_title = {}
+
+    def add(self, provider, data, primary=False):
+        items = (data or {}).get("items", [])
+        self.answered.append(provider.name)
+        self.total = max(self.total, (data or {}).get("totalItems", 0))
+        if primary:
+            self.primary = len(items)
+        for position, item in enumerate(items):
+            info = item.get("volumeInfo", {})
+            isbn = volume_isbn(info)
+            isbn = to_isbn13(isbn) if is_valid_isbn(isbn) else ""
+            title = _title_key(info)
+            index = self._by_isbn.get(isbn) if isbn else None
+            if index is None and title[0]:
+                index = self._by_title.get(title)
+            rank = (0, position) if primary else (1, len(self.items))
+            if index is None:
+                index = len(self.items)
+                self.items.append({"id": item.get("id", ""), "volumeInfo": dict(info)})
+                self._rank.append(rank)
+            else:
+                merged = self.items[index]["volumeInfo"]
+                for name, value in info.items():
+                    merged.setdefault(name, value)
+                self._rank[index] = min(self._rank[index], rank)
+            if isbn:
+                self._by_isbn.setdefault(isbn, index)
+            if title[0]:
+                self._by_title.setdefault(title, index)
+
+    def data(self):
+        order = sorted(range(len(self.items)), key=self._rank.__getitem__)
+        data = {
+            "totalItems": max(self.total, len(self.items)),
+            "items": [dict(self.items[i], volumeInfo=dict(self.items[i]["volumeInfo"])) for i in order],
+            "primaryCount": self.primary,
+            "providers": list(self.answered),
+        }
+        if self.errors:
+            data["configErrors"] = dict(self.errors)
+        return data
+
+
+_pool = ThreadPoolExecutor(max_workers=8, thread_name_prefix="provider")
+
+def _timed_search(provider, query):
+    with perf.span(f"provider.{provider.name}"):
+        return provider.search(query)
+
+def _abandon(futures):
+    # Queued calls are dropped; running ones finish in the background
+    for future in futures:
+        future.cancel()
+
+@perf.timed("providers.search")
+def search(query, providers=None, on_partial=None, token=None):
+    """Search every provider that handles ``query`` at once and merge their answers.
+
+    Each time a provider answers while others are still running,
+    ``on_partial(data)`` gets the merged results so far, so the fastest
+    answer can be shown first. A provider past its deadline is left behind
+    (its thread finishes in the background), and so is every provider once
+    ``token`` (a workers.CancelToken) is cancelled. Errors are raised only if
+    no provider answered at all, a ConfigError (such as a missing API key)
+    in preference to others.
+
+    Returns Google-style data plus "primaryCount" (items from the first
+    provider, for paging), "providers" (the names that answered) and, when a
+    provider was dropped for a ConfigError, "configErrors" ({name: message}).
+    """
+    providers = [p for p in (providers or get_providers()) if p.handles(query)]
+    start = time.monotonic()
+    futures = {_pool.submit(_timed_search, p, query): p for p in providers}
+    merged = MergedResults()
+    errors = []
+    pending = set(futures)
+    while pending:
+        timeout = max(0.0, min(start + futures[f].deadline for f in pending) - time.monotonic())
+        if token is not None:
+            timeout = min(timeout, CANCEL_POLL)
+        done, pending = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+        if token is not None and token.cancelled:
+            _abandon(pending)
+            return merged.data()
+        # Merge in provider order when several answered together
+        for future in sorted(done, key=lambda f: providers.index(futures[f])):
+            provider = futures[future]
+            try:
+                merged.add(provider, future.result(), primary=provider is providers[0])
+            except ConfigError as e:
+                # Only this provider is misconfigured; the others' answers still count
+                merged.errors[provider.name] = str(e)
+                errors.insert(0, e)
+            except Exception as e:
+                perf.count(f"provider.{provider.name}.errors")
+                errors.append(e)
+        now = time.monotonic()
+        for future in [f for f in pending if now >= start + futures[f].deadline]:
+            perf.count(f"provider.{futures[future].name}.timeouts")
+            future.cancel()
+            pending.discard(future)
+        if on_partial and pending and done and merged.items:
+            on_partial(merged.data())
+    if not merged.answered and errors:
+        raise errors[0]
+    return merged.data()
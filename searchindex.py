@@ -0,0 +1,101 @@
+import re
+import bisect
+
+import perf
+from models import SearchResult
+
+_WORD = re.compile(r"\w+")
+
+
+def tokenize(text):
+    return _WORD.findall(text.casefold())
+
+def _trigrams(token):
+    return {token[i:i + 3] for i in range(len(token) - 2)}
+
+
+class LocalIndex:
+    """In-memory prefix/trigram index over SearchResult records.
+
+    Query words of fewer than three characters match word prefixes through a
+    sorted vocabulary; longer words match any word containing them, found via
+    trigram postings. Results are ranked by how many query words they match,
+    with whole-word and prefix matches scoring above substrings.
+    """
+
+    def __init__(self):
+        self._docs = {}        # key -> SearchResult
+        self._postings = {}    # word -> set of keys
+        self._trigrams = {}    # trigram -> set of words
+        self._vocab = []       # sorted words
+
+    def __len__(self):
+        return len(self._docs)
+
+    @staticmethod
+    def _words(result):
+        return set(tokenize(f"{result.title} {result.author} {' '.join(result.categories)}"))
+
+    def add(self, key, result):
+        if key in self._docs:
+            return
+        self._docs[key] = result
+        for word in self._words(result):
+            postings = self._postings.get(word)
+            if postings is None:
+                postings = self._postings[word] = set()
+                bisect.insort(self._vocab, word)
+                for gram in _trigrams(word):
+                    self._trigrams.setdefault(gram, set()).add(word)
+            postings.add(key)
+
+    def discard(self, key):
+        result = self._docs.pop(key, None)
+        if result is None:
+            return
+        for word in self._words(result):
+            self._postings[word].discard(key)
+
+    def add_results(self, results):
+        for r in results:
+            if r.volume_id:
+                self.add(r.volume_id, r)
+
+    def add_book(self, book):
+        """Index a library Book as a search result built from its stored fields."""
+        info = {"title": book.title, "authors": [a.strip() for a in book.author.split(",") if a.strip()]}
+        if book.pages:
+            info["pageCount"] = book.pages
+        if book.isbn:
+            info["industryIdentifiers"] = [{"type": "ISBN_13", "identifier": book.isbn}]
+        self.add(f"book:{book.id}", SearchResult(f"book:{book.id}", info))
+
+    def _words_for(self, term):
+        if len(term) < 3:
+            start = bisect.bisect_left(self._vocab, term)
+            end = bisect.bisect_left(self._vocab, term + "\uffff")
+            return {w: (2 if w == term else 1) for w in self._vocab[start:end]}
+        grams = _trigrams(term)
+        candidates = set.intersection(*(self._trigrams.get(g, set()) for g in grams))
+        return {
+            w: (2 if w == term else 1.5 if w.startswith(term) else 1)
+            for w in candidates if term in w
+        }
+
+    @perf.timed("index.search")
+    def search(self, query, limit=40):
+        terms = tokenize(query)
+        if not terms:
+            return []
+        scores = {}
+        for term in terms:
+            best = {}
+            for word, weight in self._words_for(term).items():
+                for key in self._postings[word]:
+                    best[key] = max(best.get(key, 0), weight)
+            for key, weight in best.items():
+                hits, score = scores.get(key, (0, 0))
+                scores[key] = (hits + 1, score + weight)
+        matches = [(score, key) for key, (hits, score) in scores.items() if hits == len(terms)]
+        matches.sort(key=lambda m: (-m[0], self._docs[m[1]].title))
+        return [self._docs[key] for _, key in matches[:limit]]
@@ -0,0 +1,74 @@
+from collections import Counter
+
+NO_GENRE = "No Genre"
+
+
+class ReadingStats:
+    """Library aggregates kept current from Library events instead of rescans.
+
+    Built with one pass over the library, then every add, move, remove or update
+    adjusts the counts for that single book, so reading the numbers costs
+    nothing however large the library is.
+    """
+
+    def __init__(self, library):
+        self.books = Counter()      # collection -> books
+        self.words = Counter()      # collection -> words
+        self.genres = Counter()     # genre -> books
+        self.authors = Counter()    # author -> books
+        self.pages_by_month = Counter()   # "YYYY-MM" -> pages finished
+        self.unknown_length = 0     # books with no word count
+        for book in library:
+            self._apply(book, book.collection, 1)
+        library.subscribe(self.on_library_change)
+
+    def _apply(self, book, collection, sign):
+        self.books[collection] += sign
+        self.words[collection] += sign * book.word_count
+        if not book.word_count:
+            self.unknown_length += sign
+        for genre in book.categories or (NO_GENRE,):
+            self.genres[genre] += sign
+        for author in book.authors:
+            self.authors[author] += sign
+        if collection == "read_books" and book.finished:
+            self.pages_by_month[book.finished[:7]] += sign * book.pages
+
+    def on_library_change(self, event, book, source=None):
+        if event == "add":
+            self._apply(book, book.collection, 1)
+        elif event == "remove":
+            self._apply(book, book.collection, -1)
+        elif event == "move":
+            # Undo the book's old contribution; its finish date is only restamped on entering read_books
+            self._apply(book, source, -1)
+            self._apply(book, book.collection, 1)
+        elif event == "update":
+            self._apply(source, source.collection, -1)
+            self._apply(book, book.collection, 1)
+
+    @property
+    def total_books(self):
+        return sum(self.books.values())
+
+    @property
+    def total_words(self):
+        return sum(self.words.values())
+
+    @property
+    def remaining_words(self):
+        return self.words["read_later"]
+
+    @property
+    def read_words(self):
+        return self.words["read_books"]
+
+    def top_genres(self, n=15):
+        return [(g, c) for g, c in self.genres.most_common(n) if c > 0]
+
+    def top_authors(self, n=15):
+        return [(a, c) for a, c in self.authors.most_common(n) if c > 0]
+
+    def monthly_pages(self):
+        """(month, pages) pairs in calendar order."""
+        return sorted((m, p) for m, p in self.pages_by_month.items() if p > 0)
@@ -0,0 +1,260 @@
+import json
+import sqlite3
+import threading
+from pathlib import Path
+
+import perf
+
+LIBRARY_DB = Path("library.db")
+LEGACY_BOOKS_FILE = Path("books_data.json")
+COLLECTIONS = ("read_later", "read_books")
+
+# Pages of write-ahead log after which SQLite folds it back into the database
+WAL_CHECKPOINT_PAGES = 1000
+
+# Columns with their own storage; any other book keys live in the JSON "extra" column
+COLUMNS = ("title", "author", "isbn", "word_count", "notes")
+
+MIGRATIONS = [
+    """
+    CREATE TABLE books (
+        id INTEGER PRIMARY KEY,
+        collection TEXT NOT NULL,
+        position INTEGER NOT NULL,
+        title TEXT NOT NULL DEFAULT '',
+        author TEXT NOT NULL DEFAULT '',
+        isbn TEXT,
+        word_count INTEGER NOT NULL DEFAULT 0,
+        notes TEXT,
+        extra TEXT
+    );
+    CREATE INDEX books_collection ON books(collection, position);
+    CREATE INDEX books_title_author ON books(title COLLATE NOCASE, author COLLATE NOCASE);
+    CREATE INDEX books_author ON books(author COLLATE NOCASE);
+    CREATE INDEX books_isbn ON books(isbn);
+    """,
+    # AUTOINCREMENT: ids of removed books are never handed out again, so
+    # "book:<id>" keys and ids given to the CLI stay unambiguous
+    """
+    CREATE TABLE books_v2 (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        collection TEXT NOT NULL,
+        position INTEGER NOT NULL,
+        title TEXT NOT NULL DEFAULT '',
+        author TEXT NOT NULL DEFAULT '',
+        isbn TEXT,
+        word_count INTEGER NOT NULL DEFAULT 0,
+        notes TEXT,
+        extra TEXT
+    );
+    INSERT INTO books_v2 SELECT id, collection, position, title, author, isbn, word_count, notes, extra
+        FROM books;
+    DROP TABLE books;
+    ALTER TABLE books_v2 RENAME TO books;
+    CREATE INDEX books_collection ON books(collection, position);
+    CREATE INDEX books_title_author ON books(title COLLATE NOCASE, author COLLATE NOCASE);
+    CREATE INDEX books_author ON books(author COLLATE NOCASE);
+    CREATE INDEX books_isbn ON books(isbn);
+    """,
+]
+
+
+def _to_row(book):
+    extra = {k: v for k, v in book.items() if k not in COLUMNS and k != "id"}
+    return (
+        book.get("title", ""), book.get("author", ""), book.get("isbn"),
+        book.get("word_count", 0), book.get("notes"),
+        json.dumps(extra) if extra else None
+    )
+
+def _to_book(row):
+    book_id, title, author, isbn, word_count, notes, extra = row
+    book = {"id": book_id, "title": title, "author": author, "word_count": word_count}
+    if isbn:
+        book["isbn"] = isbn
+    if notes is not None:
+        book["notes"] = notes
+    if extra:
+        book.update(json.loads(extra))
+    return book
+
+
+class LibraryStore:
+    """SQLite-backed read_later/read_books collections with row-level writes.
+
+    Every mutation touches only the affected rows inside one transaction,
+    appended to a write-ahead log that is fsynced on commit: a committed
+    change survives a crash or power loss, and the library is never torn.
+    The log is folded back into the database every WAL_CHECKPOINT_PAGES
+    pages and on checkpoint()/close(). On first open an existing
+    books_data.json is imported and renamed.
+    """
+
+    def __init__(self, path=LIBRARY_DB, legacy_file=LEGACY_BOOKS_FILE):
+        self.path = Path(path)
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        # In WAL mode FULL costs one sequential fsync of the log per commit
+        self._conn.execute("PRAGMA journal_mode = WAL")
+        self._conn.execute("PRAGMA synchronous = FULL")
+        self._conn.execute(f"PRAGMA wal_autocheckpoint = {WAL_CHECKPOINT_PAGES}")
+        self._migrate()
+        if legacy_file is not None:
+            self._import_legacy(Path(legacy_file))
+
+    def _migrate(self):
+        version = self._conn.execute("PRAGMA user_version").fetchone()[0]
+        for i, script in enumerate(MIGRATIONS[version:], start=version + 1):
+            # Script and version bump commit together, so a crash never leaves a half-migrated file
+            self._conn.executescript(f"BEGIN; {script} PRAGMA user_version = {i}; COMMIT;")
+
+    def _import_legacy(self, legacy_file):
+        if not legacy_file.exists() or self.count():
+            return
+        try:
+            books = json.loads(legacy_file.read_text(encoding="utf-8"))
+        except json.JSONDecodeError:
+            return
+        with self._lock, self._conn:
+            for key in COLLECTIONS:
+                self._insert(key, books.get(key, []))
+        legacy_file.replace(legacy_file.with_name(legacy_file.name + ".migrated"))
+
+    def count(self):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM books").fetchone()[0]
+
+    @perf.timed("store.load")
+    def load(self):
+        books = {key: [] for key in COLLECTIONS}
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT collection, id, {', '.join(COLUMNS)}, extra FROM books"
+                " ORDER BY collection, position"
+            ).fetchall()
+        for row in rows:
+            books.setdefault(row[0], []).append(_to_book(row[1:]))
+        return books
+
+    def _next_position(self, collection):
+        return self._conn.execute(
+            "SELECT COALESCE(MAX(position) + 1, 0) FROM books WHERE collection = ?", (collection,)
+        ).fetchone()[0]
+
+    def _insert(self, collection, books):
+        position = self._next_position(collection)
+        ids = []
+        for offset, book in enumerate(books):
+            cur = self._conn.execute(
+                f"INSERT INTO books (collection, position, {', '.join(COLUMNS)}, extra)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (collection, position + offset) + _to_row(book)
+            )
+            ids.append(cur.lastrowid)
+        return ids
+
+    def add(self, collection, book):
+        """Append a book to a collection and return its id."""
+        return self.add_many(collection, [book])[0]
+
+    def add_many(self, collection, books):
+        with self._lock, self._conn:
+            return self._insert(collection, books)
+
+    def insert_many(self, entries):
+        """Insert (collection, book) pairs in a single transaction; returns their ids."""
+        with self._lock, self._conn:
+            return [self._insert(collection, [book])[0] for collection, book in entries]
+
+    def move(self, book_id, collection, extra=None):
+        """Append a book to ``collection``, replacing its extra dict too when one is given."""
+        with self._lock, self._conn:
+            self._conn.execute(
+                "UPDATE books SET collection = ?, position = ? WHERE id = ?",
+                (collection, self._next_position(collection), book_id)
+            )
+            if extra is not None:
+                self._conn.execute(
+                    "UPDATE books SET extra = ? WHERE id = ?", (json.dumps(extra) if extra else None, book_id)
+                )
+
+    def remove(self, book_id):
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM books WHERE id = ?", (book_id,))
+
+    def update(self, book_id, **fields):
+        """Change individual columns, e.g. update(id, notes="..."); ``extra`` replaces the extra dict."""
+        self.update_many([(book_id, fields)])
+
+    def update_many(self, changes):
+        """Apply (book_id, fields) pairs as in update(), all in one transaction."""
+        statements = []
+        for book_id, fields in changes:
+            unknown = set(fields) - set(COLUMNS) - {"extra"}
+            if unknown:
+                raise ValueError(f"Unknown book fields: {', '.join(sorted(unknown))}")
+            fields = dict(fields)
+            if "extra" in fields:
+                fields["extra"] = json.dumps(fields["extra"]) if fields["extra"] else None
+            assignments = ", ".join(f"{name} = ?" for name in fields)
+            statements.append((f"UPDATE books SET {assignments} WHERE id = ?", (*fields.values(), book_id)))
+        with self._lock, self._conn:
+            for sql, params in statements:
+                self._conn.execute(sql, params)
+
+    @perf.timed("store.sync")
+    def sync(self, books):
+        """Make the store match a whole {collection: [book, ...]} dict.
+
+        Only rows that differ are written. Books without an "id" are inserted
+        and get one assigned in place.
+        """
+        with self._lock, self._conn:
+            current = {
+                row[0]: row[1:] for row in self._conn.execute(
+                    f"SELECT id, collection, position, {', '.join(COLUMNS)}, extra FROM books"
+                )
+            }
+            seen = set()
+            for collection, items in books.items():
+                for position, book in enumerate(items):
+                    row = (collection, position) + _to_row(book)
+                    book_id = book.get("id")
+                    if book_id in current:
+                        seen.add(book_id)
+                        if current[book_id] != row:
+                            self._conn.execute(
+                                f"UPDATE books SET collection = ?, position = ?,"
+                                f" {', '.join(f'{c} = ?' for c in COLUMNS)}, extra = ? WHERE id = ?",
+                                row + (book_id,)
+                            )
+                    else:
+                        cur = self._conn.execute(
+                            f"INSERT INTO books (collection, position, {', '.join(COLUMNS)}, extra)"
+                            " VALUES (?, ?, ?, ?, ?, ?, ?, ?)", row
+                        )
+                        book["id"] = cur.lastrowid
+                        seen.add(cur.lastrowid)
+            stale = [(book_id,) for book_id in current if book_id not in seen]
+            self._conn.executemany("DELETE FROM books WHERE id = ?", stale)
+
+    def checkpoint(self):
+        """Fold the write-ahead log into the database file and truncate it."""
+        with self._lock:
+            self._conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+
+    def close(self):
+        with self._lock:
+            self._conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+            self._conn.close()
+
+
+_library = None
+_library_lock = threading.Lock()
+
+def get_store():
+    global _library
+    with _library_lock:
+        if _library is None:
+            _library = LibraryStore()
+        return _library
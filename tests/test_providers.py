@@ -0,0 +1,105 @@
+"""providers.search fan-out with stand-in providers; no network is used."""
+import sys
+import time
+import threading
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import providers
+from api import ConfigError
+from workers import CancelToken
+
+
+class Stub(providers.Provider):
+    """Answers with fixed volumes after ``delay`` seconds, or raises ``error``."""
+
+    def __init__(self, name, items=(), delay=0.0, error=None, deadline=None):
+        super().__init__(deadline)
+        self.name = name
+        self.items = list(items)
+        self.delay = delay
+        self.error = error
+
+    def search(self, query):
+        time.sleep(self.delay)
+        if self.error:
+            raise self.error
+        return {"totalItems": len(self.items), "items": self.items}
+
+
+def volume(volume_id, title, author="Ann Author", isbn=None, **info):
+    info.update(title=title, authors=[author])
+    if isbn:
+        info["industryIdentifiers"] = [{"type": "ISBN_13" if len(isbn) == 13 else "ISBN_10", "identifier": isbn}]
+    return {"id": volume_id, "volumeInfo": info}
+
+
+def test_duplicates_merge_by_isbn():
+    google = Stub("google", [volume("g1", "Dune", isbn="9780441013593")])
+    other = Stub("other", [volume("o1", "Dune: Deluxe Edition", isbn="0441013597", pageCount=412)], delay=0.05)
+    data = providers.search("dune", [google, other])
+    assert [item["id"] for item in data["items"]] == ["g1"]
+    info = data["items"][0]["volumeInfo"]
+    assert info["title"] == "Dune"
+    assert info["pageCount"] == 412
+    assert data["providers"] == ["google", "other"]
+
+
+def test_duplicates_merge_by_title_and_first_author():
+    google = Stub("google", [volume("g1", "The  Hobbit", "J. R. R. Tolkien")])
+    other = Stub("other", [
+        volume("o1", "the hobbit", "j. r. r. tolkien", categories=["Fantasy"]),
+        volume("o2", "The Hobbit", "Someone Else"),
+    ], delay=0.05)
+    data = providers.search("hobbit", [google, other])
+    assert [item["id"] for item in data["items"]] == ["g1", "o2"]
+    assert data["items"][0]["volumeInfo"]["categories"] == ["Fantasy"]
+
+
+def test_primary_items_come_first_even_when_slower():
+    partials = []
+    google = Stub("google", [volume("g1", "Primary One"), volume("g2", "Shared")], delay=0.2)
+    other = Stub("other", [volume("o1", "Shared"), volume("o2", "Other Only")])
+    data = providers.search("q", [google, other], on_partial=partials.append)
+    # The faster provider was shown first, but the final order puts the primary's items ahead
+    assert [item["id"] for item in partials[0]["items"]] == ["o1", "o2"]
+    assert [item["id"] for item in data["items"]] == ["g1", "o1", "o2"]
+    assert data["primaryCount"] == 2
+
+
+def test_provider_past_its_deadline_is_left_behind():
+    fast = Stub("fast", [volume("f1", "Fast")])
+    slow = Stub("slow", [volume("s1", "Slow")], delay=2.0, deadline=0.2)
+    start = time.monotonic()
+    data = providers.search("q", [fast, slow])
+    assert time.monotonic() - start < 1.0
+    assert [item["id"] for item in data["items"]] == ["f1"]
+    assert data["providers"] == ["fast"]
+
+
+def test_cancelled_search_returns_without_waiting():
+    token = CancelToken()
+    slow = Stub("slow", [volume("s1", "Slow")], delay=2.0)
+    threading.Timer(0.1, lambda: setattr(token, "cancelled", True)).start()
+    start = time.monotonic()
+    data = providers.search("q", [slow], token=token)
+    assert time.monotonic() - start < 1.0
+    assert data["items"] == []
+
+
+def test_config_error_drops_only_that_provider():
+    google = Stub("google", error=ConfigError("No API key"))
+    other = Stub("other", [volume("o1", "Dune")])
+    data = providers.search("dune", [google, other])
+    assert [item["id"] for item in data["items"]] == ["o1"]
+    assert data["configErrors"] == {"google": "No API key"}
+
+
+def test_config_error_is_raised_when_nothing_answered():
+    google = Stub("google", error=ConfigError("No API key"))
+    other = Stub("other", error=RuntimeError("offline"))
+    with pytest.raises(ConfigError):
+        providers.search("dune", [google, other])
@@ -0,0 +1,90 @@
+import re
+import json
+from pathlib import Path
+from importlib.util import find_spec
+from importlib.metadata import version, PackageNotFoundError
+
+from PyQt6.QtCore import QDir
+from PyQt6.QtGui import QColor, QFont, QGuiApplication, QPalette
+
+THEME_CACHE_DIR = Path("theme_cache")
+CACHE_FORMAT = 2
+
+# font declarations in the theme's "*" rule
+_GLOBAL_FONT = re.compile(r"(\*\s*\{[^}]*?)\s*font-(?:family|size):[^;]*;", re.S)
+
+
+def _material_dir():
+    # Located without importing qt_material, which drags in jinja2
+    return Path(find_spec("qt_material").origin).parent
+
+def _cache_file(theme):
+    try:
+        tag = version("qt-material")
+    except PackageNotFoundError:
+        tag = "unknown"
+    return THEME_CACHE_DIR / f"{Path(theme).stem}-{tag}-{CACHE_FORMAT}.json"
+
+def _compile(theme):
+    """Render a qt_material theme; returns what _apply needs to reproduce it."""
+    import qt_material
+    from qt_material.resources import RESOURCES_PATH
+    # Icons go to a per-theme folder so a cached stylesheet always finds its own colours
+    parent = f"theme_{Path(theme).stem}"
+    stylesheet = qt_material.build_stylesheet(theme, parent=parent, export=True)
+    if stylesheet is None:
+        return None
+    # A font in the "*" rule would pin every widget's font, so fonts could
+    # only change by restyling the whole application; without it widgets
+    # inherit QApplication's font.
+    while _GLOBAL_FONT.search(stylesheet):
+        stylesheet = _GLOBAL_FONT.sub(r"\1", stylesheet, count=1)
+    return {
+        "stylesheet": stylesheet,
+        "icons": str(Path(RESOURCES_PATH) / parent),
+        "primary": qt_material.get_theme(theme)["primaryColor"],
+    }
+
+def _apply(app, compiled):
+    QDir.setSearchPaths("icon", [compiled["icons"]])
+    palette = QGuiApplication.palette()
+    primary = compiled["primary"]
+    palette.setColor(QPalette.ColorRole.Text, QColor(*[int(primary[i:i + 2], 16) for i in (1, 3, 5)], 92))
+    QGuiApplication.setPalette(palette)
+    app.setStyle("Fusion")
+    app.setStyleSheet(compiled["stylesheet"])
+
+def apply_font(app, family, size):
+    """Make ``family``/``size`` the font of every widget, present and future.
+
+    Set once on the application and propagated by Qt to each widget that
+    has no font of its own: one pass, no stylesheet rebuild.
+    """
+    font = QFont(family, size)
+    app.setFont(font)
+    # While a stylesheet is active only class fonts reach existing widgets
+    app.setFont(font, "QWidget")
+
+def apply_theme(app, theme, font=None):
+    """Apply a qt_material theme, compiling it only if no cached copy exists.
+
+    Compiled stylesheets are kept in theme_cache/, keyed by theme and
+    qt_material version, so normal start-ups skip jinja2 entirely. ``font``
+    is an optional (family, size) to apply along with the theme.
+    """
+    path = _cache_file(theme)
+    compiled = None
+    if path.exists():
+        try:
+            compiled = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, json.JSONDecodeError):
+            compiled = None
+    if compiled is None or not Path(compiled["icons"]).is_dir():
+        compiled = _compile(theme)
+        if compiled is None:
+            return
+        THEME_CACHE_DIR.mkdir(exist_ok=True)
+        path.write_text(json.dumps(compiled), encoding="utf-8")
+    _apply(app, compiled)
+    if font:
+        apply_font(app, *font)
@@ -1,48 +1,146 @@
 ﻿import os
+import bisect
 from PyQt6.QtWidgets import (
     QWidget, QVBoxLayout, QTabWidget, QMenuBar,
-    QLabel, QLineEdit, QPushButton, QListWidget,
-    QMessageBox, QHBoxLayout, QTextEdit, QComboBox
+    QLabel, QLineEdit, QPushButton, QListView,
+    QMessageBox, QHBoxLayout, QTextEdit, QComboBox, QProgressBar,
+    QFileDialog, QInputDialog, QProgressDialog, QCheckBox,
+    QTableWidget, QTableWidgetItem, QHeaderView, QGridLayout
 )
-from PyQt6.QtGui import QAction, QPixmap, QFont
-from PyQt6.QtCore import Qt
+from PyQt6.QtGui import QAction
+from PyQt6.QtCore import Qt, QObject, QTimer, pyqtSignal
+
+from config import load_config
+from store import get_store
+from api import (
+    fetch_book_info, configure_cache, get_cache, ApiError, ConfigError, PAGE_SIZE
+)
+import providers
+from models import SearchResult, Book, Library
+from covers import load_cover, cached_pixmap, remember_pixmap
+from listmodels import SearchResultsModel, SearchFilterProxy, LibraryListModel
+from searchindex import LocalIndex
+from utils import format_reading_time
+from catalog import get_catalog
+from stats import ReadingStats
+import importer
+import enrich
+from workers import FetchEngine, CancelToken
+from theme import apply_theme, apply_font
+import perf
+
+
+# Background work, run on the FetchEngine's pool rather than the GUI thread
+def _build_local_index(books):
+    index = LocalIndex()
+    index.add_results(SearchResult.from_item(item) for item in get_cache().values("v:"))
+    for book in books:
+        index.add_book(book)
+    return index
+
+def _seed_catalog(catalog, library):
+    if not len(catalog):
+        catalog.add_volumes(get_cache().values("v:"))
+    # The CLI, importer and enrichment job change the library without the catalog listening
+    catalog.sync_library(library)
+
+def _resolve_import(path, progress):
+    return importer.resolve_entries(importer.read_entries(path), progress=progress.changed.emit)
+
+def _enrich(books, progress):
+    return enrich.enrich_books(books, progress=progress.changed.emit)
+
+
+class _SearchProgress(QObject):
+    """Carries merged results from a provider search to the GUI thread as each provider answers."""
+
+    partial = pyqtSignal(str, object)
+
+
+class _ImportProgress(QObject):
+    """Carries import and enrichment progress callbacks from the worker to the GUI thread."""
+
+    changed = pyqtSignal(int, int)
 
-from config import load_books, save_books, load_config
-from api import fetch_book_info, lookup_by_isbn
-from utils import parse_book_item, format_reading_time
-from dialogs import PreferencesDialog
 
 class BookTracker(QWidget):
     """Main UI for the Book Tracker application."""
 
-    def __init__(self, app):
+    SEARCH_DELAY_MS = 300      # debounce for search-as-you-type
+    MIN_INSTANT_CHARS = 3
+
+    def __init__(self, app, library=None):
         super().__init__()
         self.app = app
         self.setWindowTitle("📚 Book Reading Tracker")
         self.setGeometry(100, 100, 1400, 1000)
 
         # Load persistent data
-        self.books = load_books()
+        self.library = library if library is not None else Library(get_store())
         self.config = load_config()
+        configure_cache(
+            ttl=self.config["cache_ttl_hours"] * 3600,
+            max_entries=self.config["cache_max_entries"]
+        )
 
-        # For search sorting/filtering
-        self.search_results = []
-        self.original_search_results = []
+        # Search results in relevance order, sorted/filtered by the proxy
+        self.search_model = SearchResultsModel(self)
+        self.search_proxy = SearchFilterProxy(self)
+        self.search_proxy.setSourceModel(self.search_model)
+        self.search_model.more_requested.connect(self._fetch_next_page)
+        self._search_query = ""
+        self._next_start = 0
+        self._total_items = 0
+        self._local_results = []
+        self._search_token = None
+        self._search_answered = False   # the first provider answer has replaced the local matches
+        self._config_errors = set()     # provider ConfigErrors already shown, each reported once
+        self._search_progress = _SearchProgress(self)
+        self._search_progress.partial.connect(self._show_partial_results)
+
+        # Background network requests; cover prefetch gets its own pool
+        self.engine = FetchEngine(self)
+        self.cover_engine = FetchEngine(self)
+        self._covers_pending = set()
+
+        # Instant results from cached volumes and the library, built off-thread
+        books = [b for c in ("read_later", "read_books") for b in self.library.books(c)]
+        self.local_index = LocalIndex()
+        self._index_changes = []   # library events to replay on the built index
+        self.library.subscribe(self._on_library_index)
+        self.engine.submit(None, _build_local_index, books, on_done=self._set_local_index)
+
+        # Offline full-text catalog, kept current from API fetches and library edits
+        self.catalog = get_catalog()
+        self.library.subscribe(self.catalog.on_library_change)
+        self.engine.submit(None, _seed_catalog, self.catalog, self.library, on_done=lambda _: None)
+
+        # Library tabs read from these models; their widgets are built on first show
+        self.read_later_model = LibraryListModel(self.library, "read_later", self)
+        self.read_books_model = LibraryListModel(self.library, "read_books", self)
 
         # Create tabs
         self.tabs = QTabWidget()
         self.search_tab = QWidget()
         self.read_later_tab = QWidget()
         self.read_books_tab = QWidget()
+        self.stats_tab = QWidget()
 
         self.tabs.addTab(self.search_tab, "🔎 Search Books")
         self.tabs.addTab(self.read_later_tab, "📖 Read Later")
         self.tabs.addTab(self.read_books_tab, "✅ Read Books")
+        self.tabs.addTab(self.stats_tab, "📊 Statistics")
 
-        # Build each tab
+        # Only the search tab is needed to show the window
         self.setup_search_tab()
-        self.setup_read_later_tab()
-        self.setup_read_books_tab()
+        self._tab_builders = {
+            self.read_later_tab: self.setup_read_later_tab,
+            self.read_books_tab: self.setup_read_books_tab,
+            self.stats_tab: self.setup_stats_tab,
+        }
+        self.stats = None
+        self._stats_dirty = False
+        self.tabs.currentChanged.connect(self._build_tab)
 
         # Main layout
         main_layout = QVBoxLayout()
@@ -50,17 +148,30 @@ class BookTracker(QWidget):
         self.setLayout(main_layout)
 
         # Menu bar
+        self._diagnostics = None
         menu_bar = QMenuBar(self)
         self._create_menu(menu_bar)
         main_layout.setMenuBar(menu_bar)
 
     def _create_menu(self, menu_bar):
-        """Build the Preferences and About menus."""
+        """Build the File, Preferences and About menus."""
+        # File
+        file_menu = menu_bar.addMenu("File")
+        import_action = QAction("Import Books...", self)
+        import_action.triggered.connect(self._import_books)
+        file_menu.addAction(import_action)
+        enrich_action = QAction("Enrich Library...", self)
+        enrich_action.triggered.connect(self._enrich_library)
+        file_menu.addAction(enrich_action)
+
         # Preferences
         pref_menu = menu_bar.addMenu("Preferences")
         pref_action = QAction("Settings", self)
         pref_action.triggered.connect(self._show_preferences)
         pref_menu.addAction(pref_action)
+        diag_action = QAction("Diagnostics", self)
+        diag_action.triggered.connect(self._show_diagnostics)
+        pref_menu.addAction(diag_action)
 
         # About
         about_menu = menu_bar.addMenu("About")
@@ -68,10 +179,85 @@ class BookTracker(QWidget):
         about_action.triggered.connect(self._show_about)
         about_menu.addAction(about_action)
 
+    def _import_books(self):
+        """Bulk-import a Goodreads export, CSV or ISBN list in the background."""
+        path, _ = QFileDialog.getOpenFileName(
+            self, "Import Books", "", "Book lists (*.csv *.txt);;All files (*)"
+        )
+        if not path:
+            return
+        shelves = {"Read Later": "read_later", "Read Books": "read_books"}
+        shelf, ok = QInputDialog.getItem(
+            self, "Import Books", "Add books without a shelf to:", list(shelves), 0, False
+        )
+        if not ok:
+            return
+
+        dialog = QProgressDialog("Looking up books...", None, 0, 0, self)
+        dialog.setWindowTitle("Import Books")
+        dialog.setMinimumDuration(0)
+        progress = _ImportProgress(dialog)
+        progress.changed.connect(lambda done, total: (dialog.setMaximum(total), dialog.setValue(done)))
+
+        def finished(result):
+            dialog.close()
+            report = importer.store_resolved(self.library, *result, collection=shelves[shelf])
+            self.read_later_model.reload()
+            self.read_books_model.reload()
+            QMessageBox.information(self, "Import Books", report.summary())
+
+        def failed(error):
+            dialog.close()
+            self._show_error(error)
+
+        self.engine.submit(None, _resolve_import, path, progress, on_done=finished, on_error=failed)
+
+    def _enrich_library(self):
+        """Fill in missing page counts, ISBNs and genres for stored books in the background."""
+        books = [book for book in self.library if enrich.needs_enrichment(book)]
+        if not books:
+            QMessageBox.information(self, "Enrich Library", "Every book has already been checked.")
+            return
+
+        dialog = QProgressDialog("Looking up books...", None, 0, len(books), self)
+        dialog.setWindowTitle("Enrich Library")
+        dialog.setMinimumDuration(0)
+        progress = _ImportProgress(dialog)
+        progress.changed.connect(lambda done, total: dialog.setValue(done))
+
+        def finished(result):
+            dialog.close()
+            enrich.store_enrichments(self.library, result[0])
+            self.read_later_model.refresh()
+            self.read_books_model.refresh()
+            QMessageBox.information(self, "Enrich Library", enrich.summary(*result))
+
+        def failed(error):
+            dialog.close()
+            self._show_error(error)
+
+        self.engine.submit(None, _enrich, books, progress, on_done=finished, on_error=failed)
+
+    def _build_tab(self, index):
+        builder = self._tab_builders.pop(self.tabs.widget(index), None)
+        if builder:
+            builder()
+        elif self.tabs.widget(index) is self.stats_tab and self._stats_dirty:
+            self.refresh_stats()
+
     def _show_preferences(self):
         """Display the preferences dialog."""
+        from dialogs import PreferencesDialog
         PreferencesDialog(self).exec()
 
+    def _show_diagnostics(self):
+        """Show live timings and counters; the dialog stays open alongside the window."""
+        from dialogs import DiagnosticsDialog
+        if self._diagnostics is None:
+            self._diagnostics = DiagnosticsDialog(self)
+        self._diagnostics.show()
+        self._diagnostics.raise_()
+
     def _show_about(self):
         """Display the About dialog."""
         QMessageBox.about(
@@ -88,10 +274,26 @@ class BookTracker(QWidget):
         self.search_input = QLineEdit()
         self.search_input.setPlaceholderText("Enter title, author, or ISBN")
         self.search_input.returnPressed.connect(self.search_books)
+        self._search_timer = QTimer(self)
+        self._search_timer.setSingleShot(True)
+        self._search_timer.setInterval(self.SEARCH_DELAY_MS)
+        self._search_timer.timeout.connect(self._search_as_you_type)
+        self.search_input.textEdited.connect(self._search_timer.start)
 
         self.search_button = QPushButton("🔍 Search")
         self.search_button.clicked.connect(self.search_books)
 
+        self.offline_check = QCheckBox("Offline: search saved books, descriptions and notes")
+
+        # Progress while requests are in flight
+        self.progress_bar = QProgressBar()
+        self.progress_bar.setRange(0, 0)
+        self.progress_bar.setTextVisible(False)
+        self.progress_bar.setMaximumHeight(6)
+        self.progress_bar.hide()
+        self.status_label = QLabel()
+        self.engine.busy_changed.connect(self._on_busy_changed)
+
         # Sort & filter controls
         self.sorting_combo = QComboBox()
         self.sorting_combo.addItems([
@@ -108,8 +310,11 @@ class BookTracker(QWidget):
         self.genre_combo.currentIndexChanged.connect(self.filter_by_genre)
 
         # Results list
-        self.search_results_list = QListWidget()
-        self.search_results_list.itemClicked.connect(self.show_book_details)
+        self.search_results_list = QListView()
+        self.search_results_list.setUniformItemSizes(True)
+        self.search_results_list.setModel(self.search_proxy)
+        self.search_results_list.clicked.connect(self.show_book_details)
+        self.search_results_list.verticalScrollBar().valueChanged.connect(self._prefetch_covers)
 
         # Detail view
         self.book_details = QTextEdit()
@@ -133,6 +338,9 @@ class BookTracker(QWidget):
         layout.addWidget(QLabel("🔎 Search for a Book:"))
         layout.addWidget(self.search_input)
         layout.addWidget(self.search_button)
+        layout.addWidget(self.offline_check)
+        layout.addWidget(self.progress_bar)
+        layout.addWidget(self.status_label)
         layout.addWidget(QLabel("Sort Results:"))
         layout.addWidget(self.sorting_combo)
         layout.addWidget(QLabel("Filter by Genre:"))
@@ -149,89 +357,232 @@ class BookTracker(QWidget):
 
         self.search_tab.setLayout(layout)
 
+    def _on_busy_changed(self, busy):
+        self.progress_bar.setVisible(busy)
+        if not busy:
+            self.status_label.clear()
+
+    def _show_error(self, error):
+        """Report a failed background request."""
+        self.status_label.clear()
+        if isinstance(error, ConfigError):
+            QMessageBox.critical(self, error.title, str(error))
+        elif isinstance(error, ApiError):
+            QMessageBox.warning(self, error.title, str(error))
+        else:
+            QMessageBox.warning(self, "Error", f"{error}")
+
+    def _set_local_index(self, index):
+        # Keep whatever was seen or changed in the library while the index was being built
+        index.add_results(self.search_model.results())
+        for event, book in self._index_changes:
+            self._apply_index_change(index, event, book)
+        self._index_changes = None
+        self.local_index = index
+
+    def _on_library_index(self, event, book, source=None):
+        """Library subscriber keeping library books in the instant-search index."""
+        if self._index_changes is not None:
+            self._index_changes.append((event, book))
+        self._apply_index_change(self.local_index, event, book)
+
+    @staticmethod
+    def _apply_index_change(index, event, book):
+        if event in ("remove", "update"):
+            index.discard(f"book:{book.id}")
+        if event in ("add", "update"):
+            index.add_book(book)
+
     def search_books(self):
-        """Perform a search via Google Books API or ISBN lookup."""
+        """Start a search of every metadata provider in the background."""
+        self._search_timer.stop()
         query = self.search_input.text().strip()
         if not query:
             QMessageBox.warning(self, "Input Error", "Please enter a search term.")
             return
+        self._start_search(query)
 
-        self.search_results_list.clear()
-
-        # If ISBN, use isbnlib
-        if lookup_by_isbn(query):
-            title = lookup_by_isbn(query)
-            self.search_results_list.addItem(title)
+    def _search_as_you_type(self):
+        """Debounced keystrokes: search once the text settles, unless nothing changed."""
+        query = self.search_input.text().strip()
+        if len(query) < self.MIN_INSTANT_CHARS or query == self._search_query:
+            return
+        self._start_search(query)
+
+    def _start_search(self, query):
+        """Show local matches right away, then ask the providers; a newer query drops this one."""
+        self._search_query = query
+        self._search_answered = False
+        self._next_start = self._total_items = 0
+        self.engine.cancel("details")
+        self.engine.cancel("page")
+        if self.offline_check.isChecked():
+            self.engine.cancel("search")
+            results = [SearchResult.from_item(item) for item in self.catalog.search(query)]
+            self._set_results(results)
+            self.status_label.setText(f"{len(results)} offline matches")
             return
+        self._local_results = self.local_index.search(query)
+        self._set_results(self._local_results)
+        self.status_label.setText(f"Searching for \"{query}\"...")
+        on_partial = lambda data: self._search_progress.partial.emit(query, data)
+        token = self._search_token = CancelToken()
+        self.engine.submit(
+            "search", providers.search, query, None, on_partial, token,
+            on_done=self._show_search_results, on_error=self._show_error, token=token
+        )
+
+    def _show_partial_results(self, query, data):
+        """Show the fastest providers' answers while slower ones are still searching."""
+        token = self._search_token
+        if query == self._search_query and token is not None and not token.cancelled:
+            self._show_search_results(data)
 
-        # Otherwise use API
-        data = fetch_book_info(query)
+    def _show_search_results(self, data):
+        """Show provider answers: the first replaces the local matches, later ones are merged in."""
         if not data or "items" not in data:
             return
-
-        self.search_results.clear()
-        self.original_search_results.clear()
-        genres = set()
-
-        for item in data["items"]:
-            info = item["volumeInfo"]
-            title = info.get("title", "Unknown Title")
-            author = ", ".join(info.get("authors", ["Unknown Author"]))
-            rating = info.get("averageRating", "No Rating")
-            genre = ", ".join(info.get("categories", ["No Genre Available"]))
-            self.search_results.append((title, author, rating, genre))
-            self.original_search_results.append((title, author, rating, genre))
-            genres.update(info.get("categories", []))
-
-        # Update genre filter and display
+        self._report_config_errors(data.get("configErrors", {}))
+
+        results = [SearchResult.from_item(item) for item in data["items"]]
+        # Only the primary provider (Google Books) is paged further
+        self._next_start = max(self._next_start, data.get("primaryCount", len(data["items"])))
+        self._total_items = max(self._total_items, data.get("totalItems", 0))
+        if not self._search_answered:
+            # Local matches the API did not return stay at the end
+            self._search_answered = True
+            self.local_index.add_results(results)
+            self._set_results(results + self._local_results, self._has_more_pages(data))
+            return
+        # Keep the user's genre, sort and any pages already loaded
+        changed = self.search_model.merge_results(results, self._has_more_pages(data))
+        self.local_index.add_results(changed)
+        self._add_genres(changed)
+        self._prefetch_covers()
+
+    def _report_config_errors(self, errors):
+        """Tell the user once about a provider left out of searches by its configuration."""
+        new = {f"{name}: {message}" for name, message in errors.items()} - self._config_errors
+        if new:
+            self._config_errors |= new
+            QMessageBox.warning(self, ConfigError.title, "Some sources were skipped:\n" + "\n".join(sorted(new)))
+
+    @perf.timed("ui.set_results")
+    def _set_results(self, results, has_more=False):
+        """Replace the result list, resetting the genre filter."""
         self.genre_combo.blockSignals(True)
         self.genre_combo.clear()
         self.genre_combo.addItem("All Genres")
-        self.genre_combo.addItems(sorted(genres))
         self.genre_combo.blockSignals(False)
+        self._add_genres(results)
 
+        self.search_proxy.set_genre("All Genres")
+        self.search_model.set_results(results, has_more)
         self.sort_search_results()
 
-    def sort_search_results(self):
-        """Sort the in-memory search_results then filter."""
-        if not self.search_results:
-            return
+    def _has_more_pages(self, data):
+        limit = min(self._total_items, self.config["search_max_results"])
+        page = data.get("primaryCount", len(data.get("items", [])))
+        return page == PAGE_SIZE and self._next_start < limit
+
+    def _fetch_next_page(self):
+        """Request the page after the loaded results (the view asked for more rows)."""
+        query, start = self._search_query, self._next_start
+        self.status_label.setText(f"Loading more results for \"{query}\"...")
+        # Its own channel, so slower providers of the same search still arrive
+        self.engine.submit(
+            "page", fetch_book_info, query, start,
+            on_done=self._append_search_page, on_error=self._search_page_failed
+        )
 
-        method = self.sorting_combo.currentText()
-        if method == "Sort by Relevance":
-            self.search_results = self.original_search_results.copy()
-        else:
-            key_map = {
-                "Sort by Title A-Z": lambda x: x[0].lower(),
-                "Sort by Title Z-A": lambda x: x[0].lower(),
-                "Sort by Rating Ascending": lambda x: float(x[2]) if x[2] != "No Rating" else float("inf"),
-                "Sort by Rating Descending": lambda x: float(x[2]) if x[2] != "No Rating" else float("-inf")
-            }
-            reverse = method in ("Sort by Title Z-A", "Sort by Rating Descending")
-            if method in key_map:
-                self.search_results = sorted(self.search_results, key=key_map[method], reverse=reverse)
-
-        self.filter_by_genre()
+    def _append_search_page(self, data):
+        """Merge a further page into the results; the proxy places new rows in sort order."""
+        items = data.get("items", []) if data else []
+        self._next_start += len(items)
+        results = self.search_model.append_results(
+            [SearchResult.from_item(item) for item in items], self._has_more_pages(data or {})
+        )
+        self.local_index.add_results(results)
+        self._add_genres(results)
+        self._prefetch_covers()
+
+    def _search_page_failed(self, error):
+        self.search_model.stop_paging()
+        self._show_error(error)
+
+    def _add_genres(self, results):
+        """Insert genres not yet offered, keeping the combo sorted and the selection."""
+        combo = self.genre_combo
+        known = [combo.itemText(i) for i in range(1, combo.count())]
+        new = {g for r in results for g in r.categories} - set(known)
+        combo.blockSignals(True)
+        for genre in sorted(new):
+            pos = bisect.bisect(known, genre)
+            known.insert(pos, genre)
+            combo.insertItem(pos + 1, genre)
+        combo.blockSignals(False)
+
+    def sort_search_results(self):
+        """Apply the selected sort order in the proxy model."""
+        with perf.span("ui.sort"):
+            self.search_proxy.set_sort_mode(self.sorting_combo.currentText())
+        self._prefetch_covers()
 
     def filter_by_genre(self):
-        """Filter sorted results by the selected genre and display."""
-        genre = self.genre_combo.currentText()
-        self.search_results_list.clear()
-        for title, author, rating, g in self.search_results:
-            if genre == "All Genres" or genre in g:
-                self.search_results_list.addItem(f"{title} - {author} - Rating: {rating}")
+        """Apply the selected genre filter in the proxy model."""
+        with perf.span("ui.filter_by_genre"):
+            self.search_proxy.set_genre(self.genre_combo.currentText())
+        self._prefetch_covers()
+
+    def _prefetch_covers(self, *_):
+        """Download and decode covers for the rows currently in view (plus a few below)."""
+        lst, proxy = self.search_results_list, self.search_proxy
+        count = proxy.rowCount()
+        if not count:
+            return
+        first = lst.indexAt(lst.viewport().rect().topLeft()).row()
+        last = lst.indexAt(lst.viewport().rect().bottomLeft()).row()
+        first = max(first, 0)
+        last = count - 1 if last < 0 else last
+        for row in range(first, min(last + 10, count)):
+            result = proxy.index(row, 0).data(Qt.ItemDataRole.UserRole)
+            url = result.thumbnail if result else ""
+            if not url or url in self._covers_pending or cached_pixmap(url):
+                continue
+            self._covers_pending.add(url)
+            self.cover_engine.submit(
+                None, load_cover, url,
+                on_done=lambda image, url=url: self._cover_prefetched(url, image)
+            )
+
+    def _cover_prefetched(self, url, image):
+        self._covers_pending.discard(url)
+        if image is not None:
+            remember_pixmap(url, image)
 
     def show_book_details(self):
-        """Fetch and display HTML‐formatted book details and cover."""
-        item = self.search_results_list.currentItem()
-        if not item:
-            return
-        title, _ = parse_book_item(item.text())
-        data = fetch_book_info(title)
-        if not data or "items" not in data:
+        """Display the selected result's details; only the cover needs the network."""
+        result = self.search_results_list.currentIndex().data(Qt.ItemDataRole.UserRole)
+        if result is None:
             return
+        self._render_details(result.info)
+        self.engine.cancel("details")
+        url = result.thumbnail
+        pix = cached_pixmap(url) if url else None
+        if pix:
+            self.cover_image_label.setPixmap(pix)
+        elif url:
+            self.cover_image_label.clear()
+            self.engine.submit(
+                "details", load_cover, url,
+                on_done=lambda image: self._show_cover(url, image), on_error=self._show_error
+            )
+        else:
+            self.cover_image_label.clear()
 
-        info = data["items"][0]["volumeInfo"]
+    @perf.timed("ui.render_details")
+    def _render_details(self, info):
+        """Display HTML‐formatted book details."""
         authors = ", ".join(info.get("authors", []))
         categories = ", ".join(info.get("categories", []))
         rating = info.get("averageRating", "No Rating")
@@ -250,30 +601,18 @@ class BookTracker(QWidget):
         )
         self.book_details.setHtml(html)
 
-        # Cover image
-        thumb = info.get("imageLinks", {}).get("thumbnail", "")
-        if thumb:
-            try:
-                resp = fetch_book_info(thumb)
-                pix = QPixmap()
-                pix.loadFromData(req := __import__('requests').get(thumb).content)
-                self.cover_image_label.setPixmap(pix.scaled(
-                    self.cover_image_label.size(),
-                    Qt.AspectRatioMode.KeepAspectRatio,
-                    Qt.TransformationMode.SmoothTransformation
-                ))
-            except Exception:
-                self.cover_image_label.clear()
-        else:
+    def _show_cover(self, url, image):
+        if image is None:
             self.cover_image_label.clear()
+        else:
+            self.cover_image_label.setPixmap(remember_pixmap(url, image))
 
     # Read Later Tab
     def setup_read_later_tab(self):
         layout = QVBoxLayout()
-        self.read_later_list = QListWidget()
-        for b in self.books.get("read_later", []):
-            rt = format_reading_time(b["word_count"])
-            self.read_later_list.addItem(f"{b['title']} - {b['author']} - ETA: {rt}")
+        self.read_later_list = QListView()
+        self.read_later_list.setUniformItemSizes(True)
+        self.read_later_list.setModel(self.read_later_model)
 
         btns = QHBoxLayout()
         mv = QPushButton("➡ Move to Read")
@@ -290,11 +629,11 @@ class BookTracker(QWidget):
     # Read Books Tab
     def setup_read_books_tab(self):
         layout = QVBoxLayout()
-        self.read_books_list = QListWidget()
-        for b in self.books.get("read_books", []):
-            self.read_books_list.addItem(f"{b['title']} - {b['author']}")
+        self.read_books_list = QListView()
+        self.read_books_list.setUniformItemSizes(True)
+        self.read_books_list.setModel(self.read_books_model)
 
-        self.read_books_list.itemClicked.connect(self.load_notes)
+        self.read_books_list.clicked.connect(self.load_notes)
         self.notes_edit = QTextEdit()
         self.notes_edit.setPlaceholderText("Your notes...")
         save = QPushButton("💾 Save Notes")
@@ -310,107 +649,137 @@ class BookTracker(QWidget):
         layout.addWidget(rm)
         self.read_books_tab.setLayout(layout)
 
+    # Statistics Tab
+    def setup_stats_tab(self):
+        # Aggregates are built on first view, then kept current by library events
+        self.stats = ReadingStats(self.library)
+        self.library.subscribe(self._on_stats_changed)
+
+        self.stats_summary = QLabel()
+        self.genre_table = self._stats_table(("Genre", "Books"))
+        self.author_table = self._stats_table(("Author", "Books"))
+        self.monthly_table = self._stats_table(("Month", "Pages read"))
+
+        grid = QGridLayout()
+        for col, (title, table) in enumerate((
+            ("🏷 Books per Genre", self.genre_table),
+            ("✍ Books per Author", self.author_table),
+            ("📅 Pages Read per Month", self.monthly_table),
+        )):
+            grid.addWidget(QLabel(title), 0, col)
+            grid.addWidget(table, 1, col)
+
+        layout = QVBoxLayout()
+        layout.addWidget(self.stats_summary)
+        layout.addLayout(grid)
+        self.stats_tab.setLayout(layout)
+        self.refresh_stats()
+
+    @staticmethod
+    def _stats_table(headers):
+        table = QTableWidget(0, len(headers))
+        table.setHorizontalHeaderLabels(headers)
+        table.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
+        table.verticalHeader().setVisible(False)
+        table.horizontalHeader().setSectionResizeMode(0, QHeaderView.ResizeMode.Stretch)
+        return table
+
+    @staticmethod
+    def _fill_table(table, rows):
+        table.setRowCount(len(rows))
+        for r, row in enumerate(rows):
+            for c, value in enumerate(row):
+                table.setItem(r, c, QTableWidgetItem(str(value)))
+
+    def _on_stats_changed(self, *_):
+        # Redraw only while the tab is showing; otherwise when it is next opened
+        if self.tabs.currentWidget() is self.stats_tab:
+            self.refresh_stats()
+        else:
+            self._stats_dirty = True
+
+    def refresh_stats(self):
+        s = self.stats
+        self._stats_dirty = False
+        self.stats_summary.setText(
+            f"<b>Books:</b> {s.total_books} ({s.books['read_later']} to read, "
+            f"{s.books['read_books']} read)<br>"
+            f"<b>Total reading time:</b> {format_reading_time(s.total_words)}<br>"
+            f"<b>Remaining reading time:</b> {format_reading_time(s.remaining_words)}<br>"
+            f"<b>Time spent reading:</b> {format_reading_time(s.read_words)}<br>"
+            f"<b>Books without a page count:</b> {s.unknown_length}"
+        )
+        self._fill_table(self.genre_table, s.top_genres())
+        self._fill_table(self.author_table, s.top_authors())
+        self._fill_table(self.monthly_table, s.monthly_pages()[::-1])
+
     # Add / Move / Remove
     def add_to_read_later(self):
-        self._add_book_to_list("read_later", self.read_later_list)
+        self._add_book_to_list("read_later", self.read_later_model)
 
     def add_to_read(self):
-        self._add_book_to_list("read_books", self.read_books_list)
+        self._add_book_to_list("read_books", self.read_books_model)
 
-    def _add_book_to_list(self, key, widget):
-        item = self.search_results_list.currentItem()
-        if not item:
-            return
-        title, _ = parse_book_item(item.text())
-        data = fetch_book_info(title)
-        if not data or "items" not in data:
+    def _add_book_to_list(self, key, model):
+        result = self.search_results_list.currentIndex().data(Qt.ItemDataRole.UserRole)
+        if result is None:
             return
+        self._store_book(key, model, result.info)
 
-        info = data["items"][0]["volumeInfo"]
-        page_count = info.get("pageCount", 0)
-        wc = page_count * 275
-        book = {"title": info.get("title",""), "author": ", ".join(info.get("authors",[])), "word_count": wc}
-        if book not in self.books[key]:
-            self.books[key].append(book)
-            widget.addItem(f"{book['title']} - {book['author']} - ETA: {format_reading_time(wc)}")
-            save_books(self.books)
+    def _store_book(self, key, model, info):
+        book = Book.from_volume(info)
+        if self.library.add(key, book):
+            model.append(book)
 
     def move_to_read(self):
-        self._move_book(self.read_later_list, "read_later", self.read_books_list, "read_books")
+        self._move_book(self.read_later_list, self.read_later_model, self.read_books_model, "read_books")
 
     def remove_from_read_later(self):
-        self._remove_book(self.read_later_list, "read_later")
+        self._remove_book(self.read_later_list, self.read_later_model)
 
     def remove_from_read(self):
-        self._remove_book(self.read_books_list, "read_books")
+        self._remove_book(self.read_books_list, self.read_books_model)
 
-    def _move_book(self, src, src_key, dst, dst_key):
-        item = src.currentItem()
-        if not item:
+    def _move_book(self, view, src, dst, dst_key):
+        index = view.currentIndex()
+        book_id = index.data(Qt.ItemDataRole.UserRole)
+        if book_id is None:
             return
-        title, author = parse_book_item(item.text())
-        for b in self.books[src_key]:
-            if b["title"] == title and b["author"] == author:
-                self.books[src_key].remove(b)
-                self.books[dst_key].append(b)
-                dst.addItem(f"{b['title']} - {b['author']} - ETA: {format_reading_time(b['word_count'])}")
-                src.takeItem(src.row(item))
-                save_books(self.books)
-                break
-
-    def _remove_book(self, widget, key):
-        item = widget.currentItem()
-        if not item:
+        book = self.library.move(book_id, dst_key)
+        src.remove(book_id, index.row())
+        dst.append(book)
+
+    def _remove_book(self, view, model):
+        index = view.currentIndex()
+        book_id = index.data(Qt.ItemDataRole.UserRole)
+        if book_id is None:
             QMessageBox.warning(self, "Selection Error", "Please select a book.")
             return
-        title, author = parse_book_item(item.text())
-        for b in self.books[key]:
-            if b["title"] == title and b["author"] == author:
-                self.books[key].remove(b)
-                widget.takeItem(widget.row(item))
-                save_books(self.books)
-                break
+        self.library.remove(book_id)
+        model.remove(book_id, index.row())
 
     # Notes
     def save_notes(self):
-        item = self.read_books_list.currentItem()
-        if not item:
+        book_id = self.read_books_list.currentIndex().data(Qt.ItemDataRole.UserRole)
+        if book_id is None:
             QMessageBox.warning(self, "Selection Error", "Select a book first.")
             return
-        title, author = parse_book_item(item.text())
-        for b in self.books["read_books"]:
-            if b["title"] == title and b["author"] == author:
-                b["notes"] = self.notes_edit.toPlainText()
-                save_books(self.books)
-                QMessageBox.information(self, "Saved", "Notes updated.")
-                break
+        self.library.set_notes(book_id, self.notes_edit.toPlainText())
+        QMessageBox.information(self, "Saved", "Notes updated.")
 
     def load_notes(self):
-        item = self.read_books_list.currentItem()
-        if not item:
-            return
-        title, author = parse_book_item(item.text())
-        for b in self.books["read_books"]:
-            if b["title"] == title and b["author"] == author:
-                self.notes_edit.setPlainText(b.get("notes",""))
-                break
+        book = self.library.get(self.read_books_list.currentIndex().data(Qt.ItemDataRole.UserRole))
+        if book:
+            self.notes_edit.setPlainText(book.notes)
 
     # Appearance
     def apply_saved_theme(self):
-        from qt_material import apply_stylesheet
-        apply_stylesheet(self.app, theme=self.config["theme"])
+        """Apply the configured theme and font in a single restyle."""
+        apply_theme(self.app, self.config["theme"], (self.config["font"], self.config["font_size"]))
 
     def set_font(self, family, size):
-        font = QFont(family, size)
-        self.setFont(font)
-        self.app.setFont(font)
-        self._update_fonts(self)
-
-    def _update_fonts(self, widget):
-        widget.setFont(self.font())
-        for c in widget.findChildren(QWidget):
-            c.setFont(self.font())
-            self._update_fonts(c)
+        # Set once on the application; the theme stylesheet no longer pins a font, so every widget inherits it
+        apply_font(self.app, family, size)
 
     def change_theme(self, theme):
         self.config["theme"] = theme
@@ -7,4 +7,38 @@ def parse_book_item(item_text):
 def format_reading_time(words):
     mins = words // 250
     h, m = divmod(mins, 60)
-    return f"{h}h {m}m" if h else f"{m}m"
\ No newline at end of file
+    return f"{h}h {m}m" if h else f"{m}m"
+
+def volume_isbn(info):
+    """Best ISBN from a Google Books volumeInfo (ISBN-13 preferred), or ""."""
+    ids = {i.get("type"): i.get("identifier", "") for i in info.get("industryIdentifiers", [])}
+    return ids.get("ISBN_13") or ids.get("ISBN_10", "")
+
+def normalize_isbn(text):
+    """Strip spaces and hyphens; returns "" unless what is left could be an ISBN."""
+    s = text.replace("-", "").replace(" ", "").upper()
+    if len(s) == 10 and s[:9].isdigit() and (s[9].isdigit() or s[9] == "X"):
+        return s
+    if len(s) == 13 and s.isdigit():
+        return s
+    return ""
+
+def is_valid_isbn(text):
+    """Check an ISBN-10 or ISBN-13 checksum locally."""
+    s = normalize_isbn(text)
+    if len(s) == 10:
+        total = sum((10 - i) * (10 if c == "X" else int(c)) for i, c in enumerate(s))
+        return total % 11 == 0
+    if len(s) == 13:
+        total = sum((3 if i % 2 else 1) * int(c) for i, c in enumerate(s))
+        return total % 10 == 0
+    return False
+
+def to_isbn13(text):
+    """ISBN-13 form of a valid ISBN-10 or ISBN-13."""
+    s = normalize_isbn(text)
+    if len(s) == 13:
+        return s
+    core = "978" + s[:9]
+    check = (10 - sum((3 if i % 2 else 1) * int(c) for i, c in enumerate(core)) % 10) % 10
+    return core + str(check)
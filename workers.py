@@ -0,0 +1,123 @@
+import itertools
+from PyQt6.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal
+
+
+class CancelToken:
+    """Flag shared between a queued job and the engine that submitted it."""
+
+    __slots__ = ("cancelled",)
+
+    def __init__(self):
+        self.cancelled = False
+
+
+class _JobSignals(QObject):
+    finished = pyqtSignal(int, object)
+    failed = pyqtSignal(int, object)
+
+
+class _Job(QRunnable):
+    def __init__(self, job_id, token, signals, fn, args):
+        super().__init__()
+        self.job_id = job_id
+        self.token = token
+        self.signals = signals
+        self.fn = fn
+        self.args = args
+
+    def run(self):
+        if self.token.cancelled:
+            self._emit("failed", None)
+            return
+        try:
+            result = self.fn(*self.args)
+        except Exception as e:
+            self._emit("failed", e)
+        else:
+            self._emit("finished", result)
+
+    def _emit(self, name, value):
+        try:
+            getattr(self.signals, name).emit(self.job_id, value)
+        except RuntimeError:
+            # The engine was destroyed (e.g. on shutdown) while this job ran
+            pass
+
+
+class FetchEngine(QObject):
+    """Runs blocking API calls on a thread pool and reports back on the GUI thread.
+
+    Jobs submitted on the same channel supersede each other: only the result of
+    the most recent job is delivered, older ones are dropped (or skipped
+    entirely if they have not started yet).
+    """
+
+    busy_changed = pyqtSignal(bool)
+
+    def __init__(self, parent=None, max_threads=4):
+        super().__init__(parent)
+        self.pool = QThreadPool(self)
+        self.pool.setMaxThreadCount(max_threads)
+        self._ids = itertools.count(1)
+        self._jobs = {}       # job id -> (token, on_done, on_error)
+        self._channels = {}   # channel -> token of the latest job
+        self._signals = _JobSignals()
+        self._signals.finished.connect(self._on_finished)
+        self._signals.failed.connect(self._on_failed)
+        self._busy = False
+
+    def submit(self, channel, fn, *args, on_done, on_error=None, token=None):
+        """Run fn(*args) in the pool; channel=None means the job is never superseded.
+
+        A long-running fn can watch for being superseded if it is also given
+        ``token``, a CancelToken created by the caller.
+        """
+        self.cancel(channel)
+        token = token or CancelToken()
+        if channel is not None:
+            self._channels[channel] = token
+        job_id = next(self._ids)
+        self._jobs[job_id] = (token, on_done, on_error)
+        self.pool.start(_Job(job_id, token, self._signals, fn, args))
+        self._refresh_busy()
+        return token
+
+    def cancel(self, channel):
+        token = self._channels.pop(channel, None)
+        if token is not None:
+            token.cancelled = True
+            self._refresh_busy()
+
+    def cancel_all(self):
+        for channel in list(self._channels):
+            self.cancel(channel)
+
+    @property
+    def busy(self):
+        return any(not token.cancelled for token, _, _ in self._jobs.values())
+
+    def _refresh_busy(self):
+        busy = self.busy
+        if busy != self._busy:
+            self._busy = busy
+            self.busy_changed.emit(busy)
+
+    def _pop(self, job_id):
+        entry = self._jobs.pop(job_id, None)
+        self._refresh_busy()
+        if entry is None or entry[0].cancelled:
+            return None
+        for channel, token in list(self._channels.items()):
+            if token is entry[0]:
+                del self._channels[channel]
+        return entry
+
+    def _on_finished(self, job_id, result):
+        entry = self._pop(job_id)
+        if entry:
+            entry[1](result)
+
+    def _on_failed(self, job_id, error):
+        entry = self._pop(job_id)
+        if entry and entry[2] and error is not None:
+            entry[2](error)